@@ -0,0 +1,19 @@
+"""
+ASGI entry point: `gunicorn -k uvicorn.workers.UvicornWorker asgi:app`
+(or GUNICORN_WORKER_CLASS=uvicorn with gunicorn.conf.py), or
+`uvicorn asgi:app`.
+
+The Flask views stay synchronous; asgiref runs them in a thread pool while
+uvicorn's event loop handles connections, keep-alive and slow clients, so
+idle or slow connections no longer tie up a worker thread.
+"""
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as e:
+    raise ImportError('asgi.py needs the asgiref package: pip install asgiref uvicorn') from e
+
+import app as app_module
+
+# the same lazily built instance as `app:app`, so gunicorn.conf.py's fork and
+# exit hooks find it (and its engine) in app._app
+app = WsgiToAsgi(app_module.app)
@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_file, abort, url_for as flask_url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip siblings are produced without it
+    brotli = None
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ONE_YEAR = 365 * 24 * 3600
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+
+
+def minify_css(source):
+    # conservative: spaces before ':' are kept because they change selector meaning
+    css = _CSS_COMMENT.sub('', source)
+    css = _CSS_WHITESPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    # no parser here, so only drop indentation, blank lines and whole-line comments;
+    # newlines are kept so automatic semicolon insertion still works
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def build(static_folder, sources=('css', 'js')):
+    """
+    Minifies every file under static/css and static/js into static/dist with a
+    content hash in its name (style.3f2a1b9c.css), writes .gz (and .br when
+    the brotli package is installed) siblings next to each, and records the
+    mapping in static/dist/manifest.json. Returns the manifest.
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+    for folder in sources:
+        src_dir = os.path.join(static_folder, folder)
+        if not os.path.isdir(src_dir):
+            continue
+        for name in sorted(os.listdir(src_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext not in MINIFIERS:
+                continue
+            with open(os.path.join(src_dir, name), 'r', encoding='utf-8') as f:
+                body = MINIFIERS[ext](f.read()).encode('utf-8')
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            hashed = '%s/%s.%s%s' % (folder, stem, digest, ext)
+            out_path = os.path.join(dist, hashed)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            _write(out_path, body)
+            # mtime=0 keeps the .gz bytes reproducible between builds
+            _write(out_path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write(out_path + '.br', brotli.compress(body))
+            manifest['%s/%s' % (folder, name)] = hashed
+    _write(os.path.join(dist, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def _write(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class AssetPipeline:
+    """
+    Serves the fingerprinted bundles written by build().
+
+    url_for('static', filename='css/style.css') in templates is rewritten to
+    /assets/css/style.<hash>.css when the file is in the manifest, and that
+    route answers with the .br/.gz sibling matching Accept-Encoding and a
+    one-year immutable Cache-Control. Without a manifest (no build run yet)
+    templates get the plain /static URLs.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self.dist_dir = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.dist_dir = os.path.join(app.static_folder, DIST_DIR)
+        if app.config['ASSETS_USE_MANIFEST']:
+            self.manifest = self.load_manifest()
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.serve)
+        app.jinja_env.globals['url_for'] = self.url_for
+        app.extensions['assets'] = self
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.dist_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def url_for(self, endpoint, **values):
+        if endpoint == 'static' and self.manifest:
+            hashed = self.manifest.get(values.get('filename'))
+            if hashed:
+                values['filename'] = hashed
+                return flask_url_for('asset', **values)
+        return flask_url_for(endpoint, **values)
+
+    def serve(self, filename):
+        path = safe_join(self.dist_dir, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[candidate] and os.path.isfile(path + suffix):
+                path += suffix
+                encoding = candidate
+                break
+        response = send_file(path, mimetype=mimetype, max_age=ONE_YEAR, conditional=True, etag=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add('Accept-Encoding')
+        return response
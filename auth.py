@@ -0,0 +1,62 @@
+from functools import wraps
+
+from flask import flash, g, jsonify, redirect, session, url_for
+
+from content_cache import LocalCacheBackend, _MISSING
+from models import User
+
+# seconds a resolved admin stays cached; a deleted user loses access within this
+ADMIN_CACHE_TTL = 60
+
+_admins = LocalCacheBackend(max_entries=64)
+
+
+def login_admin(user):
+    """Starts an admin session for user on a fresh session id."""
+    if hasattr(session, 'regenerate'):
+        session.regenerate()
+    session.clear()
+    session['admin_user_id'] = user.id
+
+
+def logout_admin():
+    session.clear()
+
+
+def current_admin():
+    """
+    The logged-in admin as {'id', 'username'}, or None. Resolved once per
+    request (g.admin) and kept across requests for ADMIN_CACHE_TTL seconds,
+    so guarded endpoints don't query the user table every time.
+    """
+    if 'admin' in g:
+        return g.admin
+    admin = None
+    user_id = session.get('admin_user_id')
+    if user_id is not None:
+        admin = _admins.get(user_id)
+        if admin is _MISSING:
+            user = User.query.filter_by(id=user_id).first()
+            admin = {'id': user.id, 'username': user.username} if user else None
+            _admins.set(user_id, admin, ttl=ADMIN_CACHE_TTL)
+    g.admin = admin
+    return admin
+
+
+def admin_required(view=None, page=False):
+    """
+    Guards an admin view. JSON endpoints get a 401; with page=True the
+    browser is sent to the login page instead.
+    """
+    if view is None:
+        return lambda view: admin_required(view, page=page)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_admin() is None:
+            if page:
+                flash('Please log in to access the admin dashboard.', 'warning')
+                return redirect(url_for('admin.login'))
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+        return view(*args, **kwargs)
+    return wrapper
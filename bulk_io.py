@@ -0,0 +1,128 @@
+import json
+
+from sqlalchemy import insert, null, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy import types as sqltypes
+
+from models import Education, Experience, Certification, Skill, Achievement, Project
+
+# User is deliberately left out: exporting password hashes is never wanted
+BULK_MODELS = {m.__name__: m for m in (Education, Experience, Project, Certification, Skill, Achievement)}
+
+MAX_ERRORS = 100
+
+
+class RecordError(ValueError):
+    pass
+
+
+def _columns(model):
+    # ids are assigned by the database on import
+    return {c.name: c for c in model.__table__.columns if c.name != 'id'}
+
+
+def validate_record(model, data):
+    """Returns a row dict for insert(model) or raises RecordError."""
+    if not isinstance(data, dict):
+        raise RecordError('"data" must be an object')
+    columns = _columns(model)
+    unknown = set(data) - set(columns) - {'id'}
+    if unknown:
+        raise RecordError('unknown field(s): %s' % ', '.join(sorted(unknown)))
+    # every row gets every column so a batch can go out as one executemany
+    row = {}
+    for name, column in columns.items():
+        value = data.get(name)
+        if value is None:
+            if not column.nullable:
+                raise RecordError('%s may not be null' % name)
+            if isinstance(column.type, sqltypes.JSON):
+                # a plain None would be stored as the JSON text 'null'
+                value = null()
+        elif isinstance(column.type, sqltypes.JSON):
+            if not isinstance(value, (list, dict)):
+                raise RecordError('%s must be a list or object' % name)
+        elif isinstance(column.type, sqltypes.Integer):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise RecordError('%s must be an integer' % name)
+        elif isinstance(column.type, sqltypes.String):
+            if not isinstance(value, str):
+                raise RecordError('%s must be a string' % name)
+            if column.type.length and len(value) > column.type.length:
+                raise RecordError('%s is longer than %d characters' % (name, column.type.length))
+        row[name] = value
+    return row
+
+
+def export_ndjson(engine, model_names, batch_size=500):
+    """Yields one '{"model": ..., "data": {...}}' line per row, streaming from the DB."""
+    with engine.connect() as conn:
+        for name in model_names:
+            table = BULK_MODELS[name].__table__
+            result = conn.execution_options(yield_per=batch_size).execute(select(table).order_by(table.c.id))
+            for row in result.mappings():
+                yield json.dumps({'model': name, 'data': dict(row)}, default=str) + '\n'
+
+
+def import_ndjson(lines, engine, batch_size=500):
+    """
+    Reads NDJSON records from the `lines` iterable and inserts them with
+    one executemany INSERT per model per batch, each batch in its own
+    transaction. Only `batch_size` records are held in memory at a time.
+    Invalid lines are skipped and reported; the rest are still imported.
+    A batch the database refuses (a constraint violation, a lost
+    connection) is rolled back as a whole and reported against its first
+    line, and the import carries on with the next batch.
+
+    Returns {'inserted': {model: n}, 'errors': [{'line': n, 'error': msg}], 'lines': n}.
+    """
+    inserted = {}
+    errors = []
+    pending = {}
+    pending_count = 0
+    first_line = line_no = 0
+
+    def report(line, message):
+        if len(errors) < MAX_ERRORS:
+            errors.append({'line': line, 'error': message})
+
+    def flush():
+        try:
+            with engine.begin() as conn:
+                for name, rows in pending.items():
+                    conn.execute(insert(BULK_MODELS[name].__table__), rows)
+        except (IntegrityError, OperationalError) as e:
+            # engine.begin() has rolled the whole batch back
+            report(first_line, 'lines %d-%d not imported: %s' % (first_line, line_no, e.orig))
+        else:
+            for name, rows in pending.items():
+                inserted[name] = inserted.get(name, 0) + len(rows)
+        pending.clear()
+
+    for line_no, raw in enumerate(lines, start=1):
+        try:
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8')
+            if not raw.strip():
+                continue
+            record = json.loads(raw)
+            if not isinstance(record, dict):
+                raise RecordError('line must be a JSON object')
+            model = BULK_MODELS.get(record.get('model'))
+            if model is None:
+                raise RecordError('unknown model %r' % record.get('model'))
+            row = validate_record(model, record.get('data'))
+        except (ValueError, RecordError) as e:
+            # UnicodeDecodeError and JSONDecodeError are ValueErrors too
+            report(line_no, str(e))
+            continue
+        if not pending_count:
+            first_line = line_no
+        pending.setdefault(model.__name__, []).append(row)
+        pending_count += 1
+        if pending_count >= batch_size:
+            flush()
+            pending_count = 0
+    if pending:
+        flush()
+    return {'inserted': inserted, 'errors': errors, 'lines': line_no}
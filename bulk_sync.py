@@ -0,0 +1,147 @@
+import time
+
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+
+from models import Education, Experience, Certification, Achievement, Skill, Project
+
+# source values that mean "not given"; 0 is an unknown passing_year (the column is NOT NULL)
+BLANK = ('', None, 0)
+
+
+def _education_rows(data):
+    for ed in data.get('education', []):
+        yield {'degree': ed.get('degree'), 'institute': ed.get('institute'),
+               'cgpa': ed.get('cgpa', ''), 'passing_year': ed.get('passing_year') or 0}
+
+
+def _experience_rows(data):
+    for ex in data.get('professional_experience', []):
+        yield {'company': ex.get('company'), 'role': ex.get('role'),
+               'duration': ex.get('duration', ''), 'responsibilities': ex.get('responsibilities', [])}
+
+
+def _certification_rows(data):
+    for c in data.get('certifications', []):
+        # the parsed JSON holds plain strings; dicts are accepted for hand-written files
+        if isinstance(c, dict):
+            yield {'title': c.get('title'), 'organization': c.get('organization', ''), 'year': c.get('year') or ''}
+        else:
+            yield {'title': c, 'organization': '', 'year': ''}
+
+
+def _achievement_rows(data):
+    for a in data.get('achievements', []):
+        yield {'text': a}
+
+
+def _skill_rows(data):
+    for cat, items in data.get('technical_skills', {}).items():
+        for it in items:
+            yield {'category': cat, 'name': it}
+
+
+def _project_rows(data):
+    for p in data.get('projects', []):
+        yield {'title': p.get('title'), 'description': p.get('description', ''), 'link': p.get('link', '')}
+
+
+# model, natural key columns, row generator over resume_data.json
+SECTIONS = (
+    (Education, ('degree', 'institute'), _education_rows),
+    (Experience, ('company', 'role'), _experience_rows),
+    (Certification, ('title',), _certification_rows),
+    (Achievement, ('text',), _achievement_rows),
+    (Skill, ('category', 'name'), _skill_rows),
+    (Project, ('title',), _project_rows),
+)
+
+
+def sync_section(conn, model, key_columns, rows):
+    """
+    Writes `rows` into model's table, matching existing rows by natural key.
+
+    New keys are inserted with one executemany INSERT and changed rows are
+    updated with one executemany UPDATE by id. Blank source values (see
+    BLANK) never overwrite data already in the table, so edits made
+    through the admin dashboard survive a re-sync. Rows in the table that
+    are not in the source are left alone. Returns {'inserted', 'updated',
+    'unchanged'}.
+    """
+    table = model.__table__
+    value_columns = [c for c in rows[0] if c not in key_columns] if rows else []
+
+    # last occurrence wins if the source repeats a key
+    source = {}
+    for row in rows:
+        source[tuple(row[c] for c in key_columns)] = row
+
+    existing = {}
+    columns = [table.c.id] + [table.c[c] for c in key_columns] + [table.c[c] for c in value_columns]
+    for record in conn.execute(select(*columns)):
+        existing.setdefault(tuple(record[1:1 + len(key_columns)]), record)
+
+    inserts, updates = [], []
+    unchanged = 0
+    for key, row in source.items():
+        record = existing.get(key)
+        if record is None:
+            inserts.append(row)
+            continue
+        current = dict(zip(value_columns, record[1 + len(key_columns):]))
+        merged = {c: (row[c] if row[c] not in BLANK else current[c]) for c in value_columns}
+        if merged != current:
+            merged['_id'] = record[0]
+            updates.append(merged)
+        else:
+            unchanged += 1
+
+    if inserts:
+        conn.execute(insert(table), inserts)
+    if updates:
+        stmt = (update(table)
+                .where(table.c.id == bindparam('_id'))
+                .values({c: bindparam(c) for c in value_columns}))
+        conn.execute(stmt, updates)
+    return {'inserted': len(inserts), 'updated': len(updates), 'unchanged': unchanged}
+
+
+def _keys(data, key_columns, row_func):
+    return {tuple(r[c] for c in key_columns) for r in row_func(data) if all(r[c] for c in key_columns)}
+
+
+def delete_keys(conn, model, key_columns, keys):
+    """Deletes the rows whose natural key is in `keys`; returns how many went."""
+    if not keys:
+        return 0
+    table = model.__table__
+    match = or_(*(and_(*(table.c[c] == v for c, v in zip(key_columns, key))) for key in keys))
+    return conn.execute(delete(table).where(match)).rowcount
+
+
+def sync_resume_data(engine, data, previous=None):
+    """
+    Syncs every section of resume_data.json into the database, one
+    transaction per section. With `previous` (the resume data the table
+    was last synced from), rows whose key was in `previous` but is gone
+    from `data` are deleted, so an entry renamed in the resume doesn't
+    leave its old row behind; rows that never came from the resume are
+    kept. Returns {model_name: {inserted, updated, unchanged, deleted,
+    rows, ms}}.
+    """
+    report = {}
+    for model, key_columns, row_func in SECTIONS:
+        rows = [r for r in row_func(data) if all(r[c] for c in key_columns)]
+        dropped = _keys(previous, key_columns, row_func) - _keys(data, key_columns, row_func) if previous else set()
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            result = sync_section(conn, model, key_columns, rows)
+            result['deleted'] = delete_keys(conn, model, key_columns, dropped)
+        result['rows'] = len(rows)
+        result['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        report[model.__name__] = result
+    return report
+
+
+def changed_models(report):
+    return [name for name, result in report.items()
+            if result['inserted'] or result['updated'] or result.get('deleted')]
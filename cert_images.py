@@ -0,0 +1,121 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80, 'method': 4},
+}
+
+
+def _pillow():
+    # imported on first use: Pillow is only needed once an image is uploaded
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # Pillow missing: uploads keep working, just without variants
+        return None, None
+    return Image, ImageOps
+
+
+def generate_variants(certs_dir, filename, widths=(320, 640, 1280)):
+    """
+    Writes resized copies and WebP versions of certs_dir/filename into
+    certs_dir/variants and returns the metadata stored on
+    Certification.image_variants:
+
+        {'width': 3024, 'height': 4032, 'thumb': 'variants/ab12-320w.jpg',
+         'srcset': [['variants/ab12-320w.jpg', 320], ...],
+         'webp_srcset': [['variants/ab12-320w.webp', 320], ...]}
+
+    Paths are relative to certs_dir. Widths wider than the original are
+    skipped; the original itself is always the last srcset entry.
+    """
+    Image, ImageOps = _pillow()
+    if Image is None:
+        return None
+    stem, ext = os.path.splitext(filename)
+    out_dir = os.path.join(certs_dir, VARIANTS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with Image.open(os.path.join(certs_dir, filename)) as original:
+        # phone photos carry their rotation in EXIF; bake it in before resizing
+        image = ImageOps.exif_transpose(original)
+        fmt = 'PNG' if original.format == 'PNG' else 'JPEG'
+        if fmt == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        width, height = image.size
+
+        srcset, webp_srcset = [], []
+        for target in [w for w in sorted(widths) if w < width] + [width]:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS)
+            if target != width:
+                name = '%s-%dw%s' % (stem, target, '.png' if fmt == 'PNG' else '.jpg')
+                resized.save(os.path.join(out_dir, name), fmt, **SAVE_OPTIONS[fmt])
+                srcset.append([VARIANTS_DIR + '/' + name, target])
+            else:
+                srcset.append([filename, width])
+            webp_name = '%s-%dw.webp' % (stem, target)
+            resized.save(os.path.join(out_dir, webp_name), 'WEBP', **SAVE_OPTIONS['WEBP'])
+            webp_srcset.append([VARIANTS_DIR + '/' + webp_name, target])
+
+    return {
+        'width': width,
+        'height': height,
+        'thumb': srcset[0][0],
+        'srcset': srcset,
+        'webp_srcset': webp_srcset,
+    }
+
+
+class CertImageProcessor:
+    """
+    Runs generate_variants() for new uploads on a background thread so the
+    add_certification request returns as soon as the original is saved.
+    on_done(cert_id, variants) is called from the worker thread, inside
+    an app context. With an UploadStorage the original is read from (and
+    the variants written to) whatever backend it uses.
+    """
+
+    def __init__(self, app=None, on_done=None, storage=None):
+        self.on_done = on_done
+        self.storage = storage
+        self.app = None
+        self.executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.certs_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'certs')
+        self.widths = app.config['CERT_IMAGE_WIDTHS']
+        self.executor = ThreadPoolExecutor(max_workers=app.config['CERT_IMAGE_WORKERS'], thread_name_prefix='cert-images')
+        app.extensions['cert_images'] = self
+
+    @property
+    def enabled(self):
+        return _pillow()[0] is not None
+
+    def submit(self, cert_id, filename):
+        if not self.enabled:
+            return None
+        return self.executor.submit(self._process, cert_id, filename)
+
+    def _process(self, cert_id, filename):
+        try:
+            if self.storage is not None:
+                with self.storage.workdir('certs', filename) as certs_dir:
+                    variants = generate_variants(certs_dir, filename, self.widths)
+            else:
+                variants = generate_variants(self.certs_dir, filename, self.widths)
+        except Exception:
+            logger.exception('Could not generate variants for %s', filename)
+            return None
+        if self.on_done is not None:
+            with self.app.app_context():
+                self.on_done(cert_id, variants)
+        return variants
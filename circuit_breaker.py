@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of touching the database while the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around database access.
+
+    After `failure_threshold` consecutive OperationalErrors the breaker opens
+    and call() fails immediately with CircuitOpenError, so requests go
+    straight to the JSON fallback instead of waiting for a connect timeout.
+    While open, a background thread probes the database every
+    `reset_timeout` seconds (half-open) and closes the breaker once a probe
+    succeeds. Requests themselves never run the probe.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=15.0, probe=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.total_failures = 0
+        self.short_circuited = 0
+        self.probes = 0
+        self._lock = threading.Lock()
+        self._probe_thread = None
+
+    def init_app(self, app, db):
+        self.failure_threshold = app.config['DB_BREAKER_FAILURE_THRESHOLD']
+        self.reset_timeout = app.config['DB_BREAKER_RESET_TIMEOUT']
+        self.probe = make_db_probe(app, db)
+        app.extensions['db_breaker'] = self
+
+    def call(self, func):
+        if self.state != CLOSED:
+            self.short_circuited += 1
+            raise CircuitOpenError('database circuit is %s' % self.state)
+        try:
+            result = func()
+        except OperationalError:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def record_success(self):
+        if self.failures:
+            with self._lock:
+                self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            if self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        # caller holds the lock
+        logger.warning('Database circuit opened after %d failures', self.failures)
+        self.state = OPEN
+        self.opened_at = time.time()
+        if self.probe is not None and (self._probe_thread is None or not self._probe_thread.is_alive()):
+            self._probe_thread = threading.Thread(target=self._probe_loop, name='db-breaker-probe', daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.reset_timeout)
+            with self._lock:
+                self.state = HALF_OPEN
+                self.probes += 1
+            try:
+                self.probe()
+            except Exception as exc:
+                logger.info('Database probe failed: %s', exc)
+                with self._lock:
+                    self.state = OPEN
+                    self.opened_at = time.time()
+                continue
+            with self._lock:
+                logger.warning('Database circuit closed, probe succeeded')
+                self.state = CLOSED
+                self.failures = 0
+                self.opened_at = None
+            return
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'total_failures': self.total_failures,
+            'short_circuited': self.short_circuited,
+            'probes': self.probes,
+            'opened_at': self.opened_at,
+        }
+
+
+def make_db_probe(app, db):
+    """Returns a callable that runs SELECT 1 inside an app context."""
+    def probe():
+        with app.app_context():
+            try:
+                db.session.execute(text('SELECT 1'))
+            finally:
+                db.session.remove()
+    return probe
@@ -3,28 +3,7 @@ from dotenv import load_dotenv
 from pathlib import Path
 import urllib.parse
 
-# secrets
-SECRET_KEY = os.getenv("SECRET_KEY", os.getenv("FLASK_SECRET_KEY", "dev-secret"))
-
-# Prefer DATABASE_URL (Railway). If not present, fallback to local MySQL (XAMPP).
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL:
-    # accepted forms: postgresql://... or postgresql+psycopg2://...
-    SQLALCHEMY_DATABASE_URI = DATABASE_URL
-else:
-    # local dev MySQL fallback (XAMPP)
-    LOCAL_DB_USER = os.getenv("LOCAL_DB_USER", "root")
-    LOCAL_DB_PASS = os.getenv("LOCAL_DB_PASS", "")
-    LOCAL_DB_HOST = os.getenv("LOCAL_DB_HOST", "127.0.0.1")
-    LOCAL_DB_NAME = os.getenv("LOCAL_DB_NAME", "portfolio_db")
-    SQLALCHEMY_DATABASE_URI = (
-        f"mysql+pymysql://{LOCAL_DB_USER}:{urllib.parse.quote_plus(LOCAL_DB_PASS)}"
-        f"@{LOCAL_DB_HOST}:3306/{LOCAL_DB_NAME}"
-    )
-
-SQLALCHEMY_TRACK_MODIFICATIONS = False
-
-# load .env from project root
+# load .env from project root before anything reads the environment
 env_path = Path(__file__).parent / '.env'
 if env_path.exists():
     load_dotenv(env_path)
@@ -32,7 +11,182 @@ else:
     # attempt parent folder
     load_dotenv()
 
+
+def _env_bool(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def get_database_uri():
+    # Prefer DATABASE_URL (Railway/Heroku). If not present, fallback to local MySQL (XAMPP).
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        # accepted forms: postgresql://... or postgresql+psycopg2://...; some hosts still hand out postgres://
+        if database_url.startswith('postgres://'):
+            database_url = 'postgresql://' + database_url[len('postgres://'):]
+        return database_url
+    local_db_user = os.getenv('LOCAL_DB_USER', 'root')
+    local_db_pass = os.getenv('LOCAL_DB_PASS', '')
+    local_db_host = os.getenv('LOCAL_DB_HOST', '127.0.0.1')
+    local_db_name = os.getenv('LOCAL_DB_NAME', 'portfolio_db')
+    return (
+        f"mysql+pymysql://{local_db_user}:{urllib.parse.quote_plus(local_db_pass)}"
+        f"@{local_db_host}:3306/{local_db_name}"
+    )
+
+
+# Per-backend pool defaults. MySQL servers (and most hosted proxies) drop idle
+# connections well before Postgres does, so recycle them sooner.
+BACKEND_POOL_DEFAULTS = {
+    'postgresql': {'pool_size': 5, 'max_overflow': 5, 'pool_recycle': 1800},
+    'mysql': {'pool_size': 5, 'max_overflow': 5, 'pool_recycle': 280},
+}
+
+
+def build_engine_options(uri):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS for the given database URI.
+
+    Pool sizing comes from DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE and DB_POOL_PRE_PING; DB_CONNECT_TIMEOUT (seconds) and
+    DB_STATEMENT_TIMEOUT_MS are translated into driver connect_args.
+    """
+    backend = uri.split(':', 1)[0].split('+', 1)[0]
+    connect_timeout = _env_int('DB_CONNECT_TIMEOUT', 5)
+    statement_timeout = _env_int('DB_STATEMENT_TIMEOUT_MS', 10000)
+
+    if backend == 'sqlite':
+        # SQLite has no server round trip to tune; only wait on locks
+        return {'connect_args': {'timeout': connect_timeout}}
+
+    defaults = BACKEND_POOL_DEFAULTS.get(backend, BACKEND_POOL_DEFAULTS['postgresql'])
+    options = {
+        'pool_size': _env_int('DB_POOL_SIZE', defaults['pool_size']),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', defaults['max_overflow']),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', defaults['pool_recycle']),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', 'true'),
+    }
+    if backend == 'postgresql':
+        connect_args = {'connect_timeout': connect_timeout}
+        if statement_timeout:
+            connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+    elif backend == 'mysql':
+        connect_args = {
+            'connect_timeout': connect_timeout,
+            'read_timeout': _env_int('DB_READ_TIMEOUT', 30),
+            'write_timeout': _env_int('DB_WRITE_TIMEOUT', 30),
+        }
+        if statement_timeout:
+            # MySQL 5.7+; only applies to SELECT statements
+            connect_args['init_command'] = f'SET SESSION max_execution_time={statement_timeout}'
+    else:
+        connect_args = {}
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
 class Config:
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    SECRET_KEY = os.getenv('SECRET_KEY', os.getenv('FLASK_SECRET_KEY', 'dev-secret-key'))
+    SQLALCHEMY_DATABASE_URI = get_database_uri()
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # seconds between mtime checks of data/resume_data.json
+    RESUME_DATA_CHECK_INTERVAL = float(os.getenv('RESUME_DATA_CHECK_INTERVAL', '1.0'))
+    # fallback content; defaults to data/resume_data.json in the app root
+    RESUME_DATA_FILE = os.getenv('RESUME_DATA_FILE') or None
+    # content query cache: 'local' (per process) or 'shared' (CONTENT_CACHE_URL, e.g. redis://)
+    CONTENT_CACHE_BACKEND = os.getenv('CONTENT_CACHE_BACKEND', 'local')
+    CONTENT_CACHE_URL = os.getenv('CONTENT_CACHE_URL')
+    # 'local' only: file whose identity is the content version shared by all workers on the host
+    # (defaults to instance/content_version); multi-host deployments need 'shared'
+    CONTENT_VERSION_FILE = os.getenv('CONTENT_VERSION_FILE')
+    CONTENT_CACHE_TTL = int(os.getenv('CONTENT_CACHE_TTL', '300'))
+    CONTENT_CACHE_MAX_ENTRIES = int(os.getenv('CONTENT_CACHE_MAX_ENTRIES', '256'))
+    # rendered public pages; PAGE_CACHE_MAX_AGE is the Cache-Control max-age sent to browsers/CDNs
+    PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', '1') == '1'
+    PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', '600'))
+    PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', '60'))
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv('PAGE_CACHE_MAX_ENTRIES', '128'))
+    # open the DB circuit after this many consecutive failures, probe again every N seconds
+    DB_BREAKER_FAILURE_THRESHOLD = int(os.getenv('DB_BREAKER_FAILURE_THRESHOLD', '3'))
+    DB_BREAKER_RESET_TIMEOUT = float(os.getenv('DB_BREAKER_RESET_TIMEOUT', '15'))
+    # serve fingerprinted bundles from static/dist (scripts/build_assets.py) when present
+    ASSETS_USE_MANIFEST = _env_bool('ASSETS_USE_MANIFEST', 'true')
+    # resized/WebP variants generated for uploaded certificate images
+    CERT_IMAGE_WIDTHS = tuple(int(w) for w in os.getenv('CERT_IMAGE_WIDTHS', '320,640,1280').split(','))
+    CERT_IMAGE_WORKERS = _env_int('CERT_IMAGE_WORKERS', 1)
+    # certificate images and other uploads; defaults to static/uploads in the app root
+    UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER') or None
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+    # where uploads are stored: 'local' (UPLOAD_FOLDER) or 'object' (S3-compatible bucket from
+    # UPLOAD_STORAGE_URL, e.g. s3://bucket; public URLs from UPLOAD_PUBLIC_URL, else served by the app)
+    UPLOAD_STORAGE_BACKEND = os.getenv('UPLOAD_STORAGE_BACKEND', 'local')
+    UPLOAD_STORAGE_URL = os.getenv('UPLOAD_STORAGE_URL')
+    UPLOAD_STORAGE_PREFIX = os.getenv('UPLOAD_STORAGE_PREFIX', '')
+    UPLOAD_PUBLIC_URL = os.getenv('UPLOAD_PUBLIC_URL')
+    # scripts/gc_uploads.py leaves unreferenced files younger than this alone (uploads still committing)
+    UPLOAD_GC_GRACE_SECONDS = _env_int('UPLOAD_GC_GRACE_SECONDS', 3600)
+    # upload limits: whole request body, then per file type
+    MAX_CONTENT_LENGTH = _env_int('MAX_UPLOAD_MB', 16) * 1024 * 1024
+    MAX_RESUME_BYTES = _env_int('MAX_RESUME_MB', 10) * 1024 * 1024
+    MAX_CERT_IMAGE_BYTES = _env_int('MAX_CERT_IMAGE_MB', 8) * 1024 * 1024
+    # let the front-end server stream the resume: '', 'x-sendfile' or 'x-accel' (nginx internal location)
+    RESUME_OFFLOAD = os.getenv('RESUME_OFFLOAD', '')
+    RESUME_ACCEL_PREFIX = os.getenv('RESUME_ACCEL_PREFIX', '/_protected/resume/')
+    # seconds between stat() checks of static/resume/resume.pdf (uploads reload it immediately)
+    RESUME_FILE_CHECK_INTERVAL = float(os.getenv('RESUME_FILE_CHECK_INTERVAL', '1.0'))
+    # re-parse the resume after each upload, then sync the DB. Sections missing from resume_data.json
+    # are filled; those in RESUME_SYNC_SECTIONS are replaced when the PDF changed them since the last
+    # upload (the previous parse is kept in data/resume_parsed.json). Education, experience and
+    # contact details parse poorly, so by default they stay hand-curated.
+    RESUME_AUTO_SYNC = _env_bool('RESUME_AUTO_SYNC', 'true')
+    RESUME_SYNC_SECTIONS = tuple(s.strip() for s in os.getenv(
+        'RESUME_SYNC_SECTIONS', 'summary,technical_skills,certifications,achievements').split(',') if s.strip())
+    # background job queue (SQLite file, defaults to instance/jobs.sqlite3)
+    JOBS_DB_PATH = os.getenv('JOBS_DB_PATH')
+    JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '2'))
+    JOBS_LEASE_SECONDS = _env_int('JOBS_LEASE_SECONDS', 600)
+    # rows per transaction for /admin/bulk imports (and per fetch for exports)
+    BULK_BATCH_SIZE = _env_int('BULK_BATCH_SIZE', 500)
+    # items accepted in one list-valued request to /admin/add_experience, add_project or add_certification
+    ADMIN_BATCH_MAX_ITEMS = _env_int('ADMIN_BATCH_MAX_ITEMS', 200)
+
+    SEARCH_RESULT_LIMIT = _env_int('SEARCH_RESULT_LIMIT', 20)
+
+    # rows per page for /projects, /certifications and the /api listings (?limit= up to PAGE_SIZE_MAX)
+    PAGE_SIZE = _env_int('PAGE_SIZE', 20)
+    PAGE_SIZE_MAX = _env_int('PAGE_SIZE_MAX', 100)
+
+    # per-request db/template/phase breakdown in a Server-Timing response header
+    SERVER_TIMING_ENABLED = _env_bool('SERVER_TIMING_ENABLED', 'true')
+
+    # where session data lives: 'cookie' (Flask's signed cookie, no per-request lookup), 'sql'
+    # (server_session table, shared by all workers; one query per request that carries a session
+    # cookie, page-cache hits included) or 'memory' (per-process LRU, single worker only)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'cookie')
+    SESSION_MAX_ENTRIES = _env_int('SESSION_MAX_ENTRIES', 10000)
+    SESSION_COOKIE_HTTPONLY = True
+    SESSION_COOKIE_SAMESITE = 'Lax'
+
+    # proxies in front of the app whose X-Forwarded-For/-Proto are trusted. 0 (clients connect to
+    # gunicorn directly) ignores the headers, which clients could otherwise forge; Heroku's router or
+    # one nginx is 1 (the Procfile sets it)
+    PROXY_FIX_HOPS = _env_int('PROXY_FIX_HOPS', 0)
+
+    # admin login: token buckets per client IP and per username ('attempts/seconds'),
+    # kept per process ('local') or in a shared store ('shared', LOGIN_RATE_LIMIT_URL e.g. redis://)
+    LOGIN_RATE_LIMIT_BACKEND = os.getenv('LOGIN_RATE_LIMIT_BACKEND', 'local')
+    LOGIN_RATE_LIMIT_URL = os.getenv('LOGIN_RATE_LIMIT_URL', os.getenv('CONTENT_CACHE_URL'))
+    LOGIN_RATE_LIMIT_IP = os.getenv('LOGIN_RATE_LIMIT_IP', '10/60')
+    LOGIN_RATE_LIMIT_USER = os.getenv('LOGIN_RATE_LIMIT_USER', '5/60')
+    # bcrypt checks run on a pool of 'thread' or 'process' workers; extra attempts past the queue get a 503
+    LOGIN_VERIFY_EXECUTOR = os.getenv('LOGIN_VERIFY_EXECUTOR', 'thread')
+    LOGIN_VERIFY_WORKERS = _env_int('LOGIN_VERIFY_WORKERS', 2)
+    LOGIN_VERIFY_QUEUE = _env_int('LOGIN_VERIFY_QUEUE', 8)
+    LOGIN_VERIFY_TIMEOUT = float(os.getenv('LOGIN_VERIFY_TIMEOUT', '5'))
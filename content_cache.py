@@ -0,0 +1,266 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class FileVersion:
+    """
+    A version counter every worker process on the host shares through a
+    file: bump() replaces the file, and the version is its inode and
+    mtime, so reading it is one stat() and no file contents.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        return '%d-%d' % (st.st_ino, st.st_mtime_ns)
+
+    def bump(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            f.write('%d\n' % time.time_ns())
+        # a new inode every time, even when two bumps land in the same clock tick
+        os.replace(tmp_path, self.path)
+        return self.get()
+
+
+class LocalCacheBackend:
+    """
+    In-process cache with per-entry TTL and LRU eviction. With a
+    shared_version (FileVersion), an invalidation in any worker process
+    shows up here as a new version, and the entries are dropped the next
+    time the version is read.
+    """
+
+    def __init__(self, max_entries=256, shared_version=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.shared_version = shared_version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_version(self):
+        if self.shared_version is None:
+            return self._version
+        version = self.shared_version.get()
+        if version != self._version:
+            # another worker invalidated: nothing here is known to be current
+            with self._lock:
+                self._entries.clear()
+                self._version = version
+        return version
+
+    def bump_version(self):
+        if self.shared_version is not None:
+            version = self.shared_version.bump()
+            with self._lock:
+                self._entries.clear()
+                self._version = version
+            return version
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+class InMemorySharedClient:
+    """
+    Local stand-in for a shared key/value store (Redis-like get/set/delete
+    on bytes). Used when no CONTENT_CACHE_URL is configured or the redis
+    package isn't installed.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._data.get(key, (b'0', None))
+            value = int(value) + 1
+            self._data[key] = (str(value).encode(), expires_at)
+            return value
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SharedCacheBackend:
+    """Cache backend on top of a shared store so all workers see invalidations."""
+
+    def __init__(self, client, prefix='portfolio:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return _MISSING
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=int(ttl) if ttl else None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        self.client.flushdb()
+
+    def get_version(self):
+        return int(self.client.get(self.prefix + '__version__') or 0)
+
+    def bump_version(self):
+        return self.client.incr(self.prefix + '__version__')
+
+
+def make_shared_client(url):
+    if url:
+        try:
+            import redis
+        except ImportError:
+            # still works, but nothing is shared between worker processes
+            # only the scheme: the URL may carry a password
+            logger.warning('A %s:// store is configured but the redis package is not installed; '
+                           'using a per-process in-memory store', url.split('://', 1)[0])
+        else:
+            return redis.Redis.from_url(url)
+    return InMemorySharedClient()
+
+
+class ContentCache:
+    """
+    Read-through cache for the portfolio content queries.
+
+    Entries are keyed by model name (e.g. 'Experience') and hold plain
+    Python data, not ORM instances, so they can outlive the request session
+    and be pickled into a shared backend. Admin writes call invalidate()
+    with the models they touched.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = None
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if app.config['CONTENT_CACHE_BACKEND'] == 'shared':
+            self.backend = SharedCacheBackend(make_shared_client(app.config['CONTENT_CACHE_URL']))
+        else:
+            # the version lives in a file so every gunicorn worker sees another's invalidations
+            path = app.config['CONTENT_VERSION_FILE'] or os.path.join(app.instance_path, 'content_version')
+            self.backend = LocalCacheBackend(max_entries=app.config['CONTENT_CACHE_MAX_ENTRIES'],
+                                             shared_version=FileVersion(path))
+        self.ttl = app.config['CONTENT_CACHE_TTL']
+        app.extensions['content_cache'] = self
+
+    def get_or_load(self, key, loader):
+        """Returns the cached value for key, calling loader() on a miss."""
+        # reading the version drops local entries another worker has invalidated
+        self.backend.get_version()
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        # loader exceptions (e.g. OperationalError) propagate and nothing is cached
+        value = loader()
+        self.backend.set(key, value, ttl=self.ttl)
+        return value
+
+    def get_many(self, keys):
+        """Returns {key: value} for the keys currently cached; misses are left out."""
+        self.backend.get_version()
+        found = {}
+        for key in keys:
+            value = self.backend.get(key)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                found[key] = value
+        return found
+
+    def set(self, key, value):
+        self.backend.set(key, value, ttl=self.ttl)
+
+    def invalidate(self, *keys):
+        for key in keys:
+            self.backend.delete(key)
+        self.backend.bump_version()
+
+    @property
+    def version(self):
+        """Content version counter, bumped on every invalidation."""
+        return self.backend.get_version()
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
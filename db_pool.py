@@ -0,0 +1,86 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+class PoolMonitor:
+    """
+    Records connection pool checkouts and how long each one waited.
+
+    Wait time is measured around Pool.connect(), which is where a request
+    blocks when every pooled connection is checked out. Use the numbers to
+    size gunicorn workers/threads against DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.engine = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def attach(self, engine):
+        self.engine = engine
+        # pool events registered on the engine carry over to the pool engine.dispose() creates
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        # Pool.connect() has no event, so the new pool is wrapped again after each dispose
+        event.listen(engine, 'engine_disposed', self._wrap_connect)
+        self._wrap_connect(engine)
+
+    def _wrap_connect(self, engine):
+        pool = engine.pool
+        original_connect = pool.connect
+
+        def timed_connect():
+            start = time.perf_counter()
+            try:
+                return original_connect()
+            except PoolTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise
+            finally:
+                waited = time.perf_counter() - start
+                with self._lock:
+                    self.wait_total += waited
+                    if waited > self.wait_max:
+                        self.wait_max = waited
+
+        pool.connect = timed_connect
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def stats(self):
+        # always the engine's current pool, not one a dispose() has replaced
+        pool = self.engine.pool if self.engine is not None else None
+        stats = {
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'connects': self.connects,
+            'timeouts': self.timeouts,
+            'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            'wait_max_ms': round(self.wait_max * 1000, 3),
+        }
+        # QueuePool only; SQLite/NullPool don't track sizes
+        for name in ('size', 'checkedout', 'overflow', 'checkedin'):
+            func = getattr(pool, name, None)
+            if callable(func):
+                stats[name] = func()
+        return stats
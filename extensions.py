@@ -0,0 +1,75 @@
+"""
+Process-wide extension and service objects.
+
+They are created here unbound and wired to an app by create_app(), so
+views and scripts can import them without building the app, and with
+gunicorn --preload the caches and stores are set up once in the master
+and inherited by every worker.
+"""
+from flask_wtf.csrf import CSRFProtect
+from sqlalchemy.exc import OperationalError
+
+from models import db, SessionRecord
+from assets import AssetPipeline
+from cert_images import CertImageProcessor
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from content_cache import ContentCache
+from db_pool import PoolMonitor
+from instrumentation import Instrumentation
+from jobs import JobQueue
+from login_guard import LoginGuard
+from page_cache import PageCache
+from resume_server import ResumeFile
+from resume_store import ResumeDataStore
+from search import SearchIndex
+from sessions import ServerSessions
+from storage import UploadStorage
+from snapshot import SnapshotService
+
+# errors after which a route serves the JSON fallback
+DB_ERRORS = (OperationalError, CircuitOpenError)
+
+csrf = CSRFProtect()
+pool_monitor = PoolMonitor()
+content_cache = ContentCache()
+resume_store = ResumeDataStore()
+page_cache = PageCache(version_func=lambda: '%s.%s' % (content_cache.version, resume_store.version))
+assets = AssetPipeline()
+db_breaker = CircuitBreaker()
+snapshot_service = SnapshotService(content_cache, resume_store, db_breaker, DB_ERRORS)
+resume_file = ResumeFile()
+search_index = SearchIndex()
+upload_storage = UploadStorage()
+cert_images = CertImageProcessor(storage=upload_storage)
+job_queue = JobQueue()
+instrumentation = Instrumentation(engine_func=lambda: db.engine)
+login_guard = LoginGuard()
+server_sessions = ServerSessions(db=db, table=SessionRecord.__table__, breaker=db_breaker, errors=DB_ERRORS)
+
+
+def init_extensions(app):
+    server_sessions.init_app(app)
+    csrf.init_app(app)
+    with app.app_context():
+        pool_monitor.attach(db.engine)
+    content_cache.init_app(app)
+    resume_store.init_app(app)
+    page_cache.init_app(app)
+    assets.init_app(app)
+    db_breaker.init_app(app, db)
+    snapshot_service.init_app(app)
+    resume_file.init_app(app)
+    upload_storage.init_app(app)
+    cert_images.init_app(app)
+    job_queue.init_app(app)
+    instrumentation.init_app(app)
+    login_guard.init_app(app)
+    instrumentation.add_metrics(*login_guard.metrics)
+    instrumentation.add_stats('resume_store', resume_store.stats)
+    instrumentation.add_stats('content_cache', content_cache.stats)
+    instrumentation.add_stats('page_cache', page_cache.stats)
+    instrumentation.add_stats('db_breaker', db_breaker.stats)
+    instrumentation.add_stats('db_pool', pool_monitor.stats)
+    instrumentation.add_stats('login_guard', login_guard.stats)
+    instrumentation.add_stats('sessions', server_sessions.stats)
+    instrumentation.add_stats('upload_storage', upload_storage.stats)
@@ -0,0 +1,82 @@
+# gunicorn.conf.py
+# Serving profiles for gunicorn, selected by environment variables:
+#
+#   GUNICORN_WORKER_CLASS=gthread (default)  threads per process; good for a DB-bound Flask app
+#   GUNICORN_WORKER_CLASS=sync               one request per process, the old behaviour
+#   GUNICORN_WORKER_CLASS=gevent             greenlets; needs `gevent` (and `psycogreen` for Postgres)
+#   GUNICORN_WORKER_CLASS=uvicorn            serves asgi.py through uvicorn; needs `uvicorn` and `asgiref`
+#
+# With gthread keep DB_POOL_SIZE + DB_MAX_OVERFLOW >= GUNICORN_THREADS; with
+# gevent many more requests share the pool, so DB_POOL_TIMEOUT decides how
+# long one waits for a connection.
+import multiprocessing
+import os
+import sys
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'gevent': 'gevent',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+
+def _int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+profile = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+worker_class = WORKER_CLASSES.get(profile, profile)
+
+bind = '0.0.0.0:%s' % os.getenv('PORT', '8000')
+# Heroku and most PaaS set WEB_CONCURRENCY from the dyno size
+workers = _int('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8))
+threads = _int('GUNICORN_THREADS', 4 if profile == 'gthread' else 1)
+worker_connections = _int('GUNICORN_WORKER_CONNECTIONS', 1000)
+keepalive = _int('GUNICORN_KEEPALIVE', 5)
+timeout = _int('GUNICORN_TIMEOUT', 30)
+
+# recycle workers gradually (jitter keeps them from restarting together) and
+# let in-flight requests, e.g. resume downloads, finish on shutdown
+max_requests = _int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+graceful_timeout = _int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes', 'on')
+
+# used when no app is given on the command line (see Procfile)
+wsgi_app = 'asgi:app' if profile == 'uvicorn' else 'app:app'
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG') or None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    if profile == 'gevent':
+        # psycopg2 is a C extension that gevent's monkey patching can't reach;
+        # PyMySQL is pure Python and cooperates once sockets are patched
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            server.log.warning('psycogreen is not installed; psycopg2 queries will block the gevent hub')
+        else:
+            patch_psycopg()
+    if preload_app:
+        # connections opened in the master must not be shared with the children
+        _dispose_engine(close=False)
+
+
+def worker_exit(server, worker):
+    # close pooled connections instead of leaving them to time out on the server
+    _dispose_engine()
+
+
+def _dispose_engine(close=True):
+    # only if this process has built the app; never build one just to tear it down
+    app = getattr(sys.modules.get('app'), '_app', None)
+    if app is None:
+        return
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=close)
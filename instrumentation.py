@@ -0,0 +1,247 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+# seconds; Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in the Prometheus sense."""
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.help), '# TYPE %s histogram' % self.name]
+        with self._lock:
+            series = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        for label_values, (counts, total, count) in series:
+            labels = _labels(self.labels, label_values)
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append('%s_bucket{%s} %d' % (self.name, _join(labels, 'le="%s"' % _number(bound)), bucket_count))
+            lines.append('%s_bucket{%s} %d' % (self.name, _join(labels, 'le="+Inf"'), count))
+            lines.append('%s_sum{%s} %s' % (self.name, labels, _number(total)))
+            lines.append('%s_count{%s} %d' % (self.name, labels, count))
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.help), '# TYPE %s counter' % self.name]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append('%s{%s} %s' % (self.name, _labels(self.labels, label_values), _number(value)))
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join('%s="%s"' % (name, _escape(value)) for name, value in zip(names, values))
+
+
+def _join(*parts):
+    return ','.join(p for p in parts if p)
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Instrumentation:
+    """
+    Per-request timing for the Flask app, exported for Prometheus.
+
+    before/after_request hooks time each request; SQLAlchemy cursor events
+    count and time the queries it runs; the template signals time Jinja
+    rendering; track() times any other phase (e.g. building the content
+    snapshot). Totals go into per-endpoint histograms and counters served
+    at /metrics, and each response carries a Server-Timing header with
+    the breakdown for that request. Stats of the caches, circuit breaker
+    and pool are registered with add_stats() and exported as gauges.
+    """
+
+    def __init__(self, app=None, engine_func=None):
+        self.engine_func = engine_func
+        self.server_timing = True
+        self._stats = {}
+        self._metrics = []
+        self.requests = Counter('portfolio_requests_total', 'Requests by endpoint, method and status.',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram('portfolio_request_duration_seconds', 'Request latency by endpoint.',
+                                 ('endpoint',))
+        self.queries = Counter('portfolio_db_queries_total', 'SQL statements executed, by endpoint.',
+                               ('endpoint',))
+        self.query_time = Histogram('portfolio_db_query_duration_seconds', 'Time spent in SQL per request.',
+                                    ('endpoint',))
+        self.render_time = Histogram('portfolio_template_render_duration_seconds', 'Jinja render time per request.',
+                                     ('endpoint',))
+        self.phase_time = Histogram('portfolio_phase_duration_seconds', 'Time in tracked phases per request.',
+                                    ('endpoint', 'phase'))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.server_timing = app.config['SERVER_TIMING_ENABLED']
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        if self.engine_func is not None:
+            with app.app_context():
+                self.attach(self.engine_func())
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['instrumentation'] = self
+
+    def attach(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def add_metrics(self, *metrics):
+        """Serves Histograms/Counters kept by other components at /metrics too."""
+        self._metrics.extend(m for m in metrics if m not in self._metrics)
+
+    def add_stats(self, name, stats_func):
+        """Exports the numeric values of stats_func() as portfolio_<name>_<key> gauges."""
+        self._stats[name] = stats_func
+
+    # --- request hooks
+
+    @staticmethod
+    def _before_request():
+        g.instr_start = time.perf_counter()
+        g.instr_queries = 0
+        g.instr_query_time = 0.0
+        g.instr_render_time = 0.0
+        g.instr_phases = {}
+
+    def _after_request(self, response):
+        start = g.get('instr_start')
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'
+        self.requests.inc((endpoint, request.method, response.status_code))
+        self.latency.observe((endpoint,), elapsed)
+        self.queries.inc((endpoint,), g.instr_queries)
+        self.query_time.observe((endpoint,), g.instr_query_time)
+        self.render_time.observe((endpoint,), g.instr_render_time)
+        for phase, seconds in g.instr_phases.items():
+            self.phase_time.observe((endpoint, phase), seconds)
+        if self.server_timing:
+            response.headers['Server-Timing'] = self._server_timing(elapsed)
+        return response
+
+    @staticmethod
+    def _server_timing(elapsed):
+        parts = ['app;dur=%.2f' % (elapsed * 1000),
+                 'db;dur=%.2f;desc="%d queries"' % (g.instr_query_time * 1000, g.instr_queries),
+                 'tpl;dur=%.2f' % (g.instr_render_time * 1000)]
+        parts.extend('%s;dur=%.2f' % (phase, seconds * 1000) for phase, seconds in g.instr_phases.items())
+        return ', '.join(parts)
+
+    @contextmanager
+    def track(self, phase):
+        """Adds the time spent in the block to the current request's `phase`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if has_request_context() and 'instr_phases' in g:
+                g.instr_phases[phase] = g.instr_phases.get(phase, 0.0) + time.perf_counter() - start
+
+    # --- SQLAlchemy events; queries outside a request (job worker, probes) are not attributed
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('instr_query_start', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('instr_query_start')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        if has_request_context() and 'instr_queries' in g:
+            g.instr_queries += 1
+            g.instr_query_time += elapsed
+
+    # --- template signals; render_template calls don't nest, so one start per request is enough
+
+    @staticmethod
+    def _before_render(sender, template, context, **extra):
+        if 'instr_render_time' in g:
+            g.instr_render_start = time.perf_counter()
+
+    @staticmethod
+    def _after_render(sender, template, context, **extra):
+        start = g.pop('instr_render_start', None)
+        if start is not None:
+            g.instr_render_time += time.perf_counter() - start
+
+    # --- exposition
+
+    def _stats_lines(self):
+        lines = []
+        for name, stats_func in self._stats.items():
+            stats = stats_func()
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = 'portfolio_%s_%s' % (name, key)
+                lines.append('# TYPE %s gauge' % metric)
+                lines.append('%s %s' % (metric, _number(value)))
+            if 'hits' in stats and 'misses' in stats:
+                lookups = stats['hits'] + stats['misses']
+                metric = 'portfolio_%s_hit_ratio' % name
+                lines.append('# TYPE %s gauge' % metric)
+                lines.append('%s %s' % (metric, _number(stats['hits'] / lookups if lookups else 0.0)))
+        return lines
+
+    def render(self):
+        lines = []
+        for metric in (self.requests, self.latency, self.queries, self.query_time,
+                       self.render_time, self.phase_time, *self._metrics):
+            lines.extend(metric.render())
+        lines.extend(self._stats_lines())
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return Response(self.render(), content_type=PROMETHEUS_CONTENT_TYPE)
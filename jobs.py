@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class JobQueue:
+    """
+    Small persistent job queue for background work started by admin requests.
+
+    Jobs live in a local SQLite file, so they survive a restart and every
+    gunicorn worker process sees the same queue and statuses. Each process
+    runs one daemon thread that claims queued jobs with an atomic UPDATE;
+    jobs left 'running' by a worker that died are re-queued once their
+    lease expires. Handlers are registered per job kind and receive the
+    JSON payload, inside an app context; their return value is stored as
+    the job result.
+    """
+
+    def __init__(self, app=None):
+        self.handlers = {}
+        self.app = None
+        self.path = None
+        self.poll_interval = 2.0
+        self.lease = 600
+        self.worker_id = None
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.path = app.config['JOBS_DB_PATH'] or os.path.join(app.instance_path, 'jobs.sqlite3')
+        self.poll_interval = app.config['JOBS_POLL_INTERVAL']
+        self.lease = app.config['JOBS_LEASE_SECONDS']
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+        # picks up jobs queued before a restart; cheap once the thread is running
+        app.before_request(self._ensure_worker)
+        app.extensions['jobs'] = self
+
+    @contextmanager
+    def _connect(self):
+        # autocommit; each statement is its own transaction
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def register(self, kind):
+        """Decorator registering the handler for jobs of `kind`."""
+        def decorator(func):
+            self.handlers[kind] = func
+            return func
+        return decorator
+
+    def enqueue(self, kind, **payload):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(payload), QUEUED, now, now))
+        self._ensure_worker()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def recent(self, limit=10):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            # after a fork (gunicorn --preload) the parent's thread doesn't exist in the child
+            if self._thread is None or not self._thread.is_alive():
+                self.worker_id = '%d-%s' % (os.getpid(), uuid.uuid4().hex[:6])
+                self._thread = threading.Thread(target=self._run, name='job-worker', daemon=True)
+                self._thread.start()
+
+    def start(self):
+        self._ensure_worker()
+
+    def _claim(self):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND updated_at < ?',
+                         (QUEUED, RUNNING, now - self.lease))
+            while True:
+                row = conn.execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                                   (QUEUED,)).fetchone()
+                if row is None:
+                    return None
+                # another process may claim the same job between SELECT and UPDATE; retry if it did
+                cursor = conn.execute('UPDATE jobs SET status = ?, worker = ?, updated_at = ? WHERE id = ? AND status = ?',
+                                      (RUNNING, self.worker_id, now, row['id'], QUEUED))
+                if cursor.rowcount == 1:
+                    return self._to_dict(conn.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone())
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute('UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?',
+                         (status, json.dumps(result) if result is not None else None, error, time.time(), job_id))
+
+    def run_pending(self):
+        """Runs queued jobs until none are left; returns how many ran."""
+        ran = 0
+        while True:
+            job = self._claim()
+            if job is None:
+                return ran
+            ran += 1
+            handler = self.handlers.get(job['kind'])
+            if handler is None:
+                self._finish(job['id'], FAILED, error='No handler for job kind %r' % job['kind'])
+                continue
+            try:
+                with self.app.app_context():
+                    result = handler(**job['payload'])
+            except Exception:
+                logger.exception('Job %s (%s) failed', job['id'], job['kind'])
+                self._finish(job['id'], FAILED, error=traceback.format_exc(limit=3))
+            else:
+                self._finish(job['id'], DONE, result=result)
+
+    def _run(self):
+        while True:
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception('Job worker error')
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
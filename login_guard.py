@@ -0,0 +1,212 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+from content_cache import make_shared_client
+from instrumentation import Counter, Histogram
+
+# seconds; bcrypt at the default 12 rounds takes a few hundred ms per check
+VERIFY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+_dummy_hash = None
+
+
+def verify_password(pw_hash, password):
+    """
+    Runs in the verification pool. Returns (matched, seconds spent in bcrypt).
+    Unknown users are checked against a throwaway hash so they take as long
+    as a wrong password and don't reveal which usernames exist.
+    """
+    global _dummy_hash
+    from models import get_bcrypt
+    bcrypt = get_bcrypt()
+    start = time.perf_counter()
+    if pw_hash is None:
+        if _dummy_hash is None:
+            _dummy_hash = bcrypt.generate_password_hash(secrets.token_hex(16))
+        bcrypt.check_password_hash(_dummy_hash, password)
+        return False, time.perf_counter() - start
+    return bcrypt.check_password_hash(pw_hash, password), time.perf_counter() - start
+
+
+def parse_rate(value):
+    """'10/60' -> (10, 60.0): a burst of 10 attempts, refilled over 60 seconds."""
+    count, _, seconds = str(value).partition('/')
+    return int(count), float(seconds or 60)
+
+
+class LoginRejected(Exception):
+    """A login attempt turned away before or instead of checking the password."""
+
+    def __init__(self, reason, message, status, retry_after):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+        self.status = status
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class LocalBucketStore:
+    """Token buckets for this process, least recently used keys evicted first."""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        """Takes a token for key; returns 0 if there was one, else seconds until there is."""
+        rate = capacity / period
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1 if not wait else tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SharedBucketStore:
+    """
+    Token buckets in a shared key/value store (see content_cache) so every
+    worker counts against the same limits. The read-modify-write isn't
+    atomic, so two workers racing on one key can each let an attempt
+    through; the limit is still enforced to within a token or two.
+    """
+
+    def __init__(self, client, prefix='portfolio:login:'):
+        self.client = client
+        self.prefix = prefix
+
+    def take(self, key, capacity, period):
+        rate = capacity / period
+        now = time.time()
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            tokens = capacity
+        else:
+            tokens, updated = (float(x) for x in raw.decode().split(':'))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+        self.client.set(self.prefix + key, ('%f:%f' % (tokens - 1 if not wait else tokens, now)).encode(),
+                        ex=int(period) + 1)
+        return wait
+
+
+class LoginGuard:
+    """
+    Keeps admin login attempts from tying up the request workers.
+
+    throttle() runs token buckets per client IP and per username before
+    anything else happens, so a flood of POSTs is turned away without a
+    database query or a bcrypt round. verify() runs the bcrypt check on a
+    small pool (threads, or processes with LOGIN_VERIFY_EXECUTOR=process)
+    and refuses new work when more than LOGIN_VERIFY_QUEUE checks are
+    already waiting, so at most LOGIN_VERIFY_WORKERS cores ever go to
+    password hashing. Both raise LoginRejected with the status and
+    Retry-After to send.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.ip_limit = self.user_limit = None
+        self.workers = 2
+        self.queue_limit = 8
+        self.timeout = 5.0
+        self.use_processes = False
+        self._executor = None
+        self._executor_pid = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.verify_time = Histogram('portfolio_login_verify_duration_seconds',
+                                     'Admin password checks: time queued for the pool and time in bcrypt.',
+                                     ('phase',), buckets=VERIFY_BUCKETS)
+        self.attempts = Counter('portfolio_login_attempts_total', 'Admin login attempts that reached bcrypt.',
+                                ('outcome',))
+        self.rejections = Counter('portfolio_login_rejections_total', 'Admin login attempts turned away.',
+                                  ('reason',))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if app.config['LOGIN_RATE_LIMIT_BACKEND'] == 'shared':
+            self.store = SharedBucketStore(make_shared_client(app.config['LOGIN_RATE_LIMIT_URL']))
+        else:
+            self.store = LocalBucketStore()
+        self.ip_limit = parse_rate(app.config['LOGIN_RATE_LIMIT_IP'])
+        self.user_limit = parse_rate(app.config['LOGIN_RATE_LIMIT_USER'])
+        self.workers = app.config['LOGIN_VERIFY_WORKERS']
+        self.queue_limit = app.config['LOGIN_VERIFY_QUEUE']
+        self.timeout = app.config['LOGIN_VERIFY_TIMEOUT']
+        self.use_processes = app.config['LOGIN_VERIFY_EXECUTOR'] == 'process'
+        app.extensions['login_guard'] = self
+
+    @property
+    def metrics(self):
+        return (self.verify_time, self.attempts, self.rejections)
+
+    def throttle(self, ip, username):
+        """Takes a token from the IP's bucket, then the username's."""
+        for reason, key, (capacity, period) in (('ip_rate_limited', 'ip:%s' % ip, self.ip_limit),
+                                                ('user_rate_limited', 'user:%s' % username.strip().lower()[:128],
+                                                 self.user_limit)):
+            wait = self.store.take(key, capacity, period)
+            if wait:
+                self.rejections.inc((reason,))
+                raise LoginRejected(reason, 'Too many login attempts. Please try again later.', 429, wait)
+
+    def _get_executor(self):
+        # created on first use in each process: a pool inherited across gunicorn's fork is unusable
+        if self._executor is None or self._executor_pid != os.getpid():
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='login-verify')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def verify(self, pw_hash, password):
+        """Checks password against pw_hash (None for an unknown user) on the pool."""
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                busy = True
+            else:
+                busy = False
+                self._pending += 1
+                executor = self._get_executor()
+        if busy:
+            self.rejections.inc(('busy',))
+            raise LoginRejected('busy', 'The server is busy. Please try again shortly.', 503, 1)
+        start = time.perf_counter()
+        try:
+            future = executor.submit(verify_password, pw_hash, password)
+        except Exception:
+            self._release(None)
+            raise
+        # the slot is freed when the check finishes, even if this request stopped waiting
+        future.add_done_callback(self._release)
+        try:
+            matched, verify_seconds = future.result(timeout=self.timeout)
+        except TimeoutError:
+            self.rejections.inc(('timeout',))
+            raise LoginRejected('timeout', 'The server is busy. Please try again shortly.', 503, self.timeout)
+        self.verify_time.observe(('queue',), max(0.0, time.perf_counter() - start - verify_seconds))
+        self.verify_time.observe(('bcrypt',), verify_seconds)
+        self.attempts.inc(('success' if matched else 'failure',))
+        return matched
+
+    def stats(self):
+        return {'pending': self._pending, 'capacity': self.workers + self.queue_limit}
@@ -0,0 +1,53 @@
+"""Store Experience.responsibilities as native JSON
+
+Revision ID: 9b1d4e7a2c53
+Revises: 64ed07a75625
+Create Date: 2026-10-18 10:12:40.117342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1d4e7a2c53'
+down_revision = '64ed07a75625'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rows are already JSON text written with json.dumps(); empty strings
+    # are not valid JSON, so null them before the type change
+    op.execute("UPDATE experience SET responsibilities = NULL WHERE responsibilities = ''")
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('experience', 'responsibilities',
+               existing_type=sa.Text(),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='responsibilities::json')
+    else:
+        # MySQL validates the existing text during ALTER; SQLite stores JSON as text
+        with op.batch_alter_table('experience', schema=None) as batch_op:
+            batch_op.alter_column('responsibilities',
+                   existing_type=sa.Text(),
+                   type_=sa.JSON(),
+                   existing_nullable=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('experience', 'responsibilities',
+               existing_type=sa.JSON(),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using='responsibilities::text')
+    else:
+        with op.batch_alter_table('experience', schema=None) as batch_op:
+            batch_op.alter_column('responsibilities',
+                   existing_type=sa.JSON(),
+                   type_=sa.Text(),
+                   existing_nullable=True)
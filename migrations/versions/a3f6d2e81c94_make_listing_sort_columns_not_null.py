@@ -0,0 +1,46 @@
+"""Make the listing sort columns NOT NULL so their indexes serve the sort
+
+Revision ID: a3f6d2e81c94
+Revises: 7c2e9b4a1f60
+Create Date: 2026-10-18 21:02:17.448120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6d2e81c94'
+down_revision = '7c2e9b4a1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # existing NULLs become empty strings and 0 (the descending year sorts still put them last)
+    op.execute("UPDATE skill SET category = '' WHERE category IS NULL")
+    op.execute("UPDATE skill SET name = '' WHERE name IS NULL")
+    op.execute("UPDATE certification SET year = '' WHERE year IS NULL")
+    op.execute("UPDATE education SET passing_year = 0 WHERE passing_year IS NULL")
+
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.alter_column('category', existing_type=sa.String(length=128), nullable=False, server_default='')
+        batch_op.alter_column('name', existing_type=sa.String(length=128), nullable=False, server_default='')
+
+    with op.batch_alter_table('certification', schema=None) as batch_op:
+        batch_op.alter_column('year', existing_type=sa.String(length=32), nullable=False, server_default='')
+
+    with op.batch_alter_table('education', schema=None) as batch_op:
+        batch_op.alter_column('passing_year', existing_type=sa.Integer(), nullable=False, server_default='0')
+
+
+def downgrade():
+    with op.batch_alter_table('education', schema=None) as batch_op:
+        batch_op.alter_column('passing_year', existing_type=sa.Integer(), nullable=True, server_default=None)
+
+    with op.batch_alter_table('certification', schema=None) as batch_op:
+        batch_op.alter_column('year', existing_type=sa.String(length=32), nullable=True, server_default=None)
+
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.alter_column('name', existing_type=sa.String(length=128), nullable=True, server_default=None)
+        batch_op.alter_column('category', existing_type=sa.String(length=128), nullable=True, server_default=None)
@@ -1,10 +1,19 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from collections import defaultdict
-from flask_bcrypt import Bcrypt
+from sqlalchemy.orm import validates
+import json
 
 db = SQLAlchemy()
-bcrypt = Bcrypt()  # initialize in app with bcrypt.init_app(app) or by importing this module after app created
+_bcrypt = None
+
+def get_bcrypt():
+    # flask_bcrypt is only needed to set or check a password; don't pay for it on every import
+    global _bcrypt
+    if _bcrypt is None:
+        from flask_bcrypt import Bcrypt
+        _bcrypt = Bcrypt()
+    return _bcrypt
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -14,17 +23,38 @@ class User(db.Model):
 
     def set_password(self, password):
         # stores bcrypt hash (bytes -> decode to str)
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = get_bcrypt().generate_password_hash(password).decode('utf-8')
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return get_bcrypt().check_password_hash(self.password_hash, password)
+
+class SessionRecord(db.Model):
+    # server-side session data for SESSION_BACKEND='sql' (see sessions.py); the cookie holds only the id
+    __tablename__ = 'server_session'
+    id = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
 class Experience(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     company = db.Column(db.String(256))
     role = db.Column(db.String(256))
     duration = db.Column(db.String(128))
-    responsibilities = db.Column(db.Text)  # JSON list stored as text
+    responsibilities = db.Column(db.JSON)  # list of strings, decoded by the driver on load
+
+    @validates('responsibilities')
+    def validate_responsibilities(self, key, value):
+        # accept legacy JSON-encoded strings so callers never store a string
+        if isinstance(value, str):
+            try:
+                value = json.loads(value) if value else []
+            except json.JSONDecodeError:
+                value = [value]
+        return value
+
+    def to_dict(self):
+        return {'id': self.id, 'company': self.company, 'role': self.role,
+                'duration': self.duration, 'responsibilities': self.responsibilities}
 
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -32,24 +62,43 @@ class Project(db.Model):
     description = db.Column(db.Text)
     link = db.Column(db.String(512))
 
+    def to_dict(self):
+        return {'id': self.id, 'title': self.title, 'description': self.description, 'link': self.link}
+
 class Education(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     degree = db.Column(db.String(256))
     institute = db.Column(db.String(256))
     cgpa = db.Column(db.String(64))
-    passing_year = db.Column(db.Integer)
+    # NOT NULL (0 when unknown, sorting last) so ix_education_passing_year can serve the listing order
+    passing_year = db.Column(db.Integer, index=True, nullable=False, server_default='0')
+
+    def to_dict(self):
+        return {'id': self.id, 'degree': self.degree, 'institute': self.institute,
+                'cgpa': self.cgpa, 'passing_year': self.passing_year}
 
 class Certification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(512))
     organization = db.Column(db.String(256))
-    year = db.Column(db.String(32))
+    year = db.Column(db.String(32), index=True, nullable=False, server_default='')
     image_file = db.Column(db.String(256), nullable=True)  # Stores the filename of the certificate image
+    image_variants = db.Column(db.JSON, nullable=True)  # thumbnail/srcset metadata from cert_images.generate_variants
+
+    def to_dict(self):
+        return {'id': self.id, 'title': self.title, 'organization': self.organization,
+                'year': self.year, 'image_file': self.image_file, 'image_variants': self.image_variants}
 
 class Skill(db.Model):
+    # serves get_skills_by_category and the keyset-paginated skill listing
+    __table_args__ = (db.Index('ix_skill_category_name', 'category', 'name'),)
+
     id = db.Column(db.Integer, primary_key=True)
-    category = db.Column(db.String(128))
-    name = db.Column(db.String(128))
+    category = db.Column(db.String(128), nullable=False, server_default='')
+    name = db.Column(db.String(128), nullable=False, server_default='')
+
+    def to_dict(self):
+        return {'id': self.id, 'category': self.category, 'name': self.name}
 
     @classmethod
     def get_skills_by_category(cls):
@@ -57,7 +106,7 @@ class Skill(db.Model):
         Queries all skills and groups them by category.
         """
         skills_by_category = defaultdict(list)
-        skills = cls.query.order_by(cls.category, cls.name).all()
+        skills = cls.query.order_by(cls.category, cls.name, cls.id).all()
         for skill in skills:
             skills_by_category[skill.category].append(skill)
         return dict(skills_by_category)
@@ -65,3 +114,6 @@ class Skill(db.Model):
 class Achievement(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.String(512))
+
+    def to_dict(self):
+        return {'id': self.id, 'text': self.text}
@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import g, request, session, make_response, message_flashed
+
+from content_cache import LocalCacheBackend, _MISSING
+
+
+class PageCache:
+    """
+    Rendered-HTML cache for the public pages.
+
+    Entries are keyed by path, query string, admin flag and the current
+    content version (see ContentCache.version and ResumeDataStore.version),
+    so an admin write makes every cached page stale at once. Each entry
+    carries an ETag and Last-Modified, and conditional GETs are answered
+    with 304 without rendering anything.
+    """
+
+    def __init__(self, app=None, version_func=None):
+        self.version_func = version_func
+        self.backend = None
+        self.enabled = True
+        self.max_age = 0
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config['PAGE_CACHE_ENABLED']
+        self.max_age = app.config['PAGE_CACHE_MAX_AGE']
+        self.ttl = app.config['PAGE_CACHE_TTL']
+        self.backend = LocalCacheBackend(max_entries=app.config['PAGE_CACHE_MAX_ENTRIES'])
+        message_flashed.connect(self._on_flash, app)
+        app.extensions['page_cache'] = self
+
+    @staticmethod
+    def skip():
+        """Keeps the current request's response out of the cache (e.g. it was built from fallback data)."""
+        g.page_cache_skip = True
+
+    def _on_flash(self, sender, message, category, **extra):
+        self.skip()
+
+    def _key(self, is_admin):
+        version = self.version_func() if self.version_func else ''
+        return '%s?%s|admin=%d|v=%s' % (request.path, request.query_string.decode('latin-1'), is_admin, version)
+
+    def _finish(self, response, etag, last_modified, is_admin):
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        if is_admin:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+        else:
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+        return response.make_conditional(request)
+
+    def cached(self, view):
+        """Decorator for GET views (HTML or JSON) whose output depends only on content data."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # pending flash messages are rendered into the page, so never cache those
+            if not self.enabled or request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            is_admin = 'admin_user_id' in session
+            key = self._key(is_admin)
+            entry = self.backend.get(key)
+            if entry is not _MISSING:
+                self.hits += 1
+                body, etag, last_modified, mimetype = entry
+                response = make_response(body)
+                response.mimetype = mimetype
+                return self._finish(response, etag, last_modified, is_admin)
+
+            self.misses += 1
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or g.get('page_cache_skip'):
+                # the view flashed (e.g. DB down) or failed; serve it uncached
+                return response
+            body = response.get_data()
+            etag = hashlib.sha1(key.encode('utf-8') + body).hexdigest()
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+            self.backend.set(key, (body, etag, last_modified, response.mimetype), ttl=self.ttl)
+            return self._finish(response, etag, last_modified, is_admin)
+        return wrapper
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
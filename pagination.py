@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+
+from sqlalchemy import and_, or_
+
+from models import db, Education, Experience, Project, Certification, Skill, Achievement
+
+# listing name -> (model, sort key as (column, descending) pairs). Every key
+# ends in the primary key, so the order is total and doesn't depend on how
+# the database happens to return rows inserted in the same order. Sort
+# columns are NOT NULL: an IS NULL term in the ORDER BY or the keyset
+# predicate keeps the listing indexes from serving the sort.
+ORDERINGS = {
+    'Education': (Education, ((Education.passing_year, True), (Education.id, False))),
+    'Experience': (Experience, ((Experience.id, False),)),
+    'Project': (Project, ((Project.id, True),)),
+    'Certification': (Certification, ((Certification.year, True), (Certification.id, True))),
+    'Skill': (Skill, ((Skill.category, False), (Skill.name, False), (Skill.id, False))),
+    'Achievement': (Achievement, ((Achievement.id, False),)),
+}
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor, key):
+    """Values of the sort `key` columns from a cursor, each checked against its column type."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise CursorError('invalid cursor')
+    if not isinstance(values, list) or len(values) != len(key):
+        raise CursorError('invalid cursor')
+    for (column, _), value in zip(key, values):
+        # bool is an int subclass, but never a valid sort value
+        if isinstance(value, bool) or not isinstance(value, column.type.python_type):
+            raise CursorError('invalid cursor')
+    return values
+
+
+def _order_by(key):
+    return [column.desc() if descending else column.asc() for column, descending in key]
+
+
+def _after(key, values):
+    """WHERE clause selecting the rows that sort after `values` under `key`."""
+    alternatives = []
+    equal = []
+    for (column, descending), value in zip(key, values):
+        alternatives.append(and_(*equal, column < value if descending else column > value))
+        equal.append(column == value)
+    # the redundant bound on the leading column turns the scan into an index range search
+    (column, descending), value = key[0], values[0]
+    return and_(column <= value if descending else column >= value, or_(*alternatives))
+
+
+def ordered(name):
+    """Query over the listing's model in its canonical order."""
+    model, key = ORDERINGS[name]
+    return model.query.order_by(*_order_by(key))
+
+
+class Page:
+    __slots__ = ('items', 'next')
+
+    def __init__(self, items, next):
+        self.items = items
+        self.next = next
+
+
+def keyset_page(name, after=None, limit=20):
+    """
+    Returns one Page of `name` (a key of ORDERINGS) as to_dict() rows.
+    `after` is the opaque cursor from the previous page's `next`; each page
+    is a single indexed range scan however deep it is, unlike OFFSET.
+    Raises CursorError for a malformed cursor.
+    """
+    model, key = ORDERINGS[name]
+    query = ordered(name)
+    if after:
+        query = query.filter(_after(key, decode_cursor(after, key)))
+    # one extra row tells us whether there is a next page
+    rows = query.limit(limit + 1).all()
+    try:
+        items = [row.to_dict() for row in rows[:limit]]
+    finally:
+        db.session.rollback()
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([last[column.key] for column, _ in key])
+    return Page(items, next_cursor)
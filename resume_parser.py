@@ -0,0 +1,228 @@
+"""
+Heuristic parser turning a resume PDF into the resume_data.json structure.
+
+    data, from_cache = parse_resume('assets/resume.pdf', cache_path='data/.resume_cache.json')
+    write_resume_data(data, 'data/resume_data.json')
+
+Pages are extracted in a process pool, and extracted text is cached per
+page content hash, so unchanged PDFs (or unchanged pages) are not
+re-extracted. Sections are split in a single pass over the lines.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# bump when parse_text() output changes so cached results are discarded
+PARSER_VERSION = 2
+
+# only spawn worker processes when there are enough pages to pay for them
+POOL_MIN_PAGES = 4
+
+HEADING_LINE = re.compile(r'^[A-Z][A-Z ]+$')
+SKILL_KEY_CHARS = re.compile(r'[^A-Za-z ]')
+CGPA = re.compile(r'CGPA\s*[-:]?\s*([0-9.]+)')
+YEAR = re.compile(r'\b(20\d{2})\b')
+
+# heading as it appears with spaces removed (PDF extraction splits words, e.g. 'PROJEC TS') -> section key
+HEADINGS = {
+    'SUMMARY': 'summary',
+    'TECHNICALSKILLS': 'technical_skills',
+    'EDUCATION': 'education',
+    'PROFESSIONALEXPERIENCE': 'professional_experience',
+    'PROJECTS': 'projects',
+    'TRAINING': 'training',
+    'CERTIFICATION': 'certifications',
+    'CERTIFICATIONS': 'certifications',
+    'ACHIEVEMENTS': 'achievements',
+    'ADDITIONALDETAILS': 'additional_details',
+}
+
+
+def _extract_page(args):
+    path, index = args
+    from PyPDF2 import PdfReader
+    return PdfReader(path).pages[index].extract_text() or ''
+
+
+def _page_key(page):
+    contents = page.get_contents()
+    raw = contents.get_data() if contents is not None else b''
+    return hashlib.sha256(raw).hexdigest()
+
+
+def extract_pages(path, page_cache=None, workers=None):
+    """
+    Returns the text of every page. page_cache maps page content hashes to
+    text and is updated in place: only pages missing from it are extracted,
+    and entries for pages no longer in the PDF are dropped.
+    """
+    from PyPDF2 import PdfReader
+
+    page_cache = page_cache if page_cache is not None else {}
+    reader = PdfReader(path)
+    keys = [_page_key(page) for page in reader.pages]
+    missing = [i for i, key in enumerate(keys) if key not in page_cache]
+
+    if len(missing) >= POOL_MIN_PAGES and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            texts = list(pool.map(_extract_page, [(path, i) for i in missing]))
+    else:
+        texts = [reader.pages[i].extract_text() or '' for i in missing]
+    for i, text in zip(missing, texts):
+        page_cache[keys[i]] = text
+    for stale in set(page_cache) - set(keys):
+        del page_cache[stale]
+    return [page_cache[key] for key in keys]
+
+
+def split_sections(lines):
+    """Single pass: returns ({section_key: [lines]}, lines before the first heading)."""
+    sections = {}
+    preamble = []
+    current = preamble
+    for line in lines:
+        if HEADING_LINE.match(line):
+            key = HEADINGS.get(line.replace(' ', ''))
+            if key is not None:
+                current = sections.setdefault(key, [])
+                continue
+        current.append(line)
+    return sections, preamble
+
+
+def _bullets(lines, markers=('•',)):
+    items = []
+    for line in lines:
+        if any(marker in line for marker in markers):
+            item = line.replace('•', '').strip()
+            if item:
+                items.append(item)
+    return items
+
+
+def parse_text(text):
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    sections, preamble = split_sections(lines)
+    data = {'name': preamble[0] if preamble else ''}
+
+    if 'summary' in sections:
+        data['summary'] = ' '.join(sections['summary'])
+
+    # lines like '❖ Programming Languages : Python, C, PHP'
+    skills = {}
+    for line in sections.get('technical_skills', []):
+        if ':' in line:
+            k, v = line.split(':', 1)
+            k = SKILL_KEY_CHARS.sub('', k).strip().lower().replace(' ', '_')
+            skills[k] = [x.strip() for x in v.split(',') if x.strip()]
+    data['technical_skills'] = skills
+
+    if 'education' in sections:
+        ed_lines = sections['education']
+        block = '\n'.join(ed_lines)
+        cgpa = CGPA.search(block)
+        year = YEAR.search(block)
+        data['education'] = [{
+            'degree': ed_lines[0] if ed_lines else '',
+            'institute': ed_lines[1] if len(ed_lines) > 1 else '',
+            'cgpa': cgpa.group(1) if cgpa else '',
+            'passing_year': int(year.group(1)) if year else '',
+        }] if ed_lines else []
+
+    if 'professional_experience' in sections:
+        # company lines are upper case; the line after a company is the role
+        experiences = []
+        cur = {}
+        for l in sections['professional_experience']:
+            if l.isupper() and len(l.split()) > 1:
+                if cur:
+                    experiences.append(cur)
+                cur = {'company': l}
+            elif 'role' not in cur:
+                cur['role'] = l
+            else:
+                cur['details'] = (cur.get('details', '') + '\n' + l).strip()
+        if cur:
+            experiences.append(cur)
+        data['professional_experience'] = experiences
+
+    data['certifications'] = _bullets(sections.get('certifications', []), markers=('•', '-', ','))
+    data['achievements'] = _bullets(sections.get('achievements', []))
+    return data
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_cache(cache_path):
+    if not cache_path:
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get('parser_version') == PARSER_VERSION else {}
+
+
+def parse_resume(pdf_path, cache_path=None, workers=None, force=False):
+    """
+    Parses pdf_path and returns (data, from_cache). from_cache is True when
+    the PDF is byte-identical to the last parse and nothing was extracted.
+    """
+    checksum = file_sha256(pdf_path)
+    cache = _load_cache(cache_path)
+    if not force and cache.get('sha256') == checksum and 'data' in cache:
+        return cache['data'], True
+
+    page_cache = {} if force else cache.get('pages', {})
+    pages = extract_pages(pdf_path, page_cache=page_cache, workers=workers)
+    data = parse_text('\n'.join(pages))
+
+    if cache_path:
+        write_json_atomic(cache_path, {'parser_version': PARSER_VERSION, 'sha256': checksum,
+                                       'pages': page_cache, 'data': data})
+    return data, False
+
+
+def write_json_atomic(path, obj, **dump_kwargs):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+
+def write_resume_data(data, out_path):
+    # temp file + rename so the running app never reads a partial file
+    write_json_atomic(out_path, data, indent=2)
+
+
+def merge_parsed(current, parsed, previous=None, sections=()):
+    """
+    Applies a new parse to the curated resume data. Sections `current`
+    lacks or has empty are filled from the parse. Sections named in
+    `sections` are replaced when the parse of them changed since
+    `previous` (the last upload's parse; None when there is none, which
+    takes every listed section that differs). A section that reads the
+    same as last time keeps its hand edits, and an empty parse never
+    wipes anything. The heuristic parse has no contact details and
+    flattens education and experience, so those are best left out of
+    `sections`. Returns (merged, names of the sections taken from the parse).
+    """
+    merged = dict(current)
+    taken = []
+    for key, value in parsed.items():
+        if not value or value == merged.get(key):
+            continue
+        if not merged.get(key) or (key in sections and (previous is None or value != previous.get(key))):
+            merged[key] = value
+            taken.append(key)
+    return merged, taken
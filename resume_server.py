@@ -0,0 +1,146 @@
+import hashlib
+import mmap
+import os
+import threading
+import time
+
+from flask import Response
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Loaded:
+    """One memory-mapped version of the resume; replaced wholesale on reload."""
+
+    __slots__ = ('signature', 'data', 'size', 'etag')
+
+    def __init__(self, signature, data, etag):
+        self.signature = signature
+        self.data = data
+        self.size = len(data)
+        self.etag = etag
+
+
+class ResumeFile:
+    """
+    Keeps static/resume/resume.pdf memory-mapped and serves it with ETag,
+    If-None-Match and single-range Range support.
+
+    The mapping is re-validated with os.stat() at most every
+    `check_interval` seconds (upload_resume calls reload() directly). A
+    reload swaps in a new mapping; responses still streaming the old one
+    keep their reference, so they finish with the bytes they started with.
+
+    With offload set to 'x-sendfile' or 'x-accel', only headers are
+    returned and the front-end server (Apache mod_xsendfile / nginx
+    internal location at `accel_prefix`) streams the file.
+    """
+
+    def __init__(self, path=None, check_interval=1.0, offload=None, accel_prefix='/_protected/resume/', app=None):
+        self.path = path
+        self.check_interval = check_interval
+        self.offload = offload or None
+        self.accel_prefix = accel_prefix
+        self._lock = threading.Lock()
+        self._loaded = None
+        self._checked_at = 0.0
+        self.reloads = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.path = os.path.join(app.static_folder, 'resume', 'resume.pdf')
+        self.check_interval = app.config['RESUME_FILE_CHECK_INTERVAL']
+        self.offload = app.config['RESUME_OFFLOAD'] or None
+        self.accel_prefix = app.config['RESUME_ACCEL_PREFIX']
+        app.extensions['resume_file'] = self
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load(self, signature):
+        with open(self.path, 'rb') as f:
+            if signature[1] == 0:
+                data = b''
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # hashed once per version; the ETag changes exactly when the bytes do
+        return _Loaded(signature, data, hashlib.sha256(data).hexdigest()[:32])
+
+    def current(self):
+        """Returns the loaded resume, or None when the file doesn't exist."""
+        now = time.monotonic()
+        loaded = self._loaded
+        if loaded is not None and now - self._checked_at < self.check_interval:
+            return loaded
+        signature = self._signature()
+        if loaded is not None and signature == loaded.signature:
+            self._checked_at = now
+            return loaded
+        with self._lock:
+            loaded = self._loaded
+            if signature is None:
+                self._loaded = None
+            elif loaded is None or loaded.signature != signature:
+                self._loaded = self._load(signature)
+                if loaded is not None:
+                    self.reloads += 1
+            self._checked_at = now
+            return self._loaded
+
+    def reload(self):
+        self._checked_at = 0.0
+        return self.current()
+
+    def send(self, request, download_name='resume.pdf'):
+        """Builds the response for `request`, or returns None if there is no resume."""
+        loaded = self.current()
+        if loaded is None:
+            return None
+
+        response = Response(mimetype='application/pdf')
+        response.set_etag(loaded.etag)
+        response.headers['Content-Disposition'] = 'attachment; filename=%s' % download_name
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.cache_control.no_cache = True
+
+        if loaded.etag in request.if_none_match:
+            response.status_code = 304
+            return response
+
+        if self.offload == 'x-sendfile':
+            response.headers['X-Sendfile'] = os.path.abspath(self.path)
+            return response
+        if self.offload == 'x-accel':
+            response.headers['X-Accel-Redirect'] = self.accel_prefix + os.path.basename(self.path)
+            return response
+
+        start, stop = 0, loaded.size
+        byte_range = request.range
+        # multipart/byteranges isn't supported; several ranges get the full body
+        if (byte_range is not None and byte_range.units == 'bytes' and len(byte_range.ranges) == 1
+                and self._if_range_matches(request, loaded)):
+            bounds = byte_range.range_for_length(loaded.size)
+            if bounds is None:
+                response.status_code = 416
+                response.headers['Content-Range'] = 'bytes */%d' % loaded.size
+                return response
+            start, stop = bounds
+            response.status_code = 206
+            response.headers['Content-Range'] = 'bytes %d-%d/%d' % (start, stop - 1, loaded.size)
+
+        data = loaded.data
+        response.response = (data[i:min(i + CHUNK_SIZE, stop)] for i in range(start, stop, CHUNK_SIZE))
+        response.content_length = stop - start
+        return response
+
+    @staticmethod
+    def _if_range_matches(request, loaded):
+        if_range = request.if_range
+        if if_range.etag is None and if_range.date is None:
+            return True
+        return if_range.etag == loaded.etag
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+
+
+class ResumeDataStore:
+    """
+    Process-wide cache for data/resume_data.json.
+
+    The file is parsed once and re-validated with a cheap os.stat() on each
+    access. When scripts/parse_resume.py rewrites it (mtime, size or inode
+    change) the new contents are parsed and swapped in under a lock, so
+    readers always see either the old or the new data, never a partial one.
+    """
+
+    def __init__(self, path=None, check_interval=1.0, app=None):
+        self.path = path
+        # seconds between stat() calls; 0 means stat on every access
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._data = None
+        self._signature = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.path = app.config['RESUME_DATA_FILE'] or os.path.join(app.root_path, 'data', 'resume_data.json')
+        self.check_interval = app.config['RESUME_DATA_CHECK_INTERVAL']
+        app.extensions['resume_store'] = self
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _parse(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def get(self, now=None):
+        """Returns the parsed resume data, reloading it if the file changed."""
+        now = now if now is not None else time.monotonic()
+        data = self._data
+        if data is not None and now - self._checked_at < self.check_interval:
+            self.hits += 1
+            return data
+
+        signature = self._stat_signature()
+        if data is not None and signature == self._signature:
+            self._checked_at = now
+            self.hits += 1
+            return data
+
+        with self._lock:
+            # another thread may have reloaded while we waited for the lock
+            if self._data is not None and signature == self._signature:
+                self.hits += 1
+                return self._data
+            self.misses += 1
+            if signature is None:
+                new_data = {}
+            else:
+                new_data = self._parse()
+                if new_data is None:
+                    # half-written or invalid file: keep serving the last good copy
+                    self._checked_at = now
+                    return self._data if self._data is not None else {}
+            if self._data is not None:
+                self.reloads += 1
+            self._data = new_data
+            self._signature = signature
+            self._checked_at = now
+            return new_data
+
+    def invalidate(self):
+        """Forces the next access to re-read the file."""
+        with self._lock:
+            self._signature = None
+            self._checked_at = 0.0
+
+    @property
+    def version(self):
+        """Short token identifying the currently loaded file contents."""
+        self.get()
+        if self._signature is None:
+            return '0'
+        mtime_ns, size, _ = self._signature
+        return '%x-%x' % (mtime_ns, size)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'reloads': self.reloads}
@@ -0,0 +1,39 @@
+# scripts/backfill_cert_images.py
+# Generate thumbnails/WebP variants for certificate images already in upload storage
+import os
+import sys
+
+# Add project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import create_app
+from extensions import content_cache, upload_storage
+from models import db, Certification
+from cert_images import generate_variants
+
+force = '--force' in sys.argv
+app = create_app(blueprints=())
+
+with app.app_context():
+    variants_by_file = {}
+    for name, _ in sorted(upload_storage.list('certs')):
+        # originals only: variants live in a subdirectory, in-flight uploads under dot names
+        if '/' in name or name.startswith('.') or '.' not in name:
+            continue
+        if name.rsplit('.', 1)[1].lower() not in app.config['ALLOWED_EXTENSIONS']:
+            continue
+        with upload_storage.workdir('certs', name) as certs_dir:
+            variants = generate_variants(certs_dir, name, app.config['CERT_IMAGE_WIDTHS'])
+        if variants is None:
+            print('Pillow is not installed; nothing to do.')
+            raise SystemExit(1)
+        variants_by_file[name] = variants
+        print('Processed', name, '%dx%d' % (variants['width'], variants['height']))
+
+    updated = 0
+    for cert in Certification.query.filter(Certification.image_file.isnot(None)).all():
+        if cert.image_file in variants_by_file and (force or not cert.image_variants):
+            cert.image_variants = variants_by_file[cert.image_file]
+            updated += 1
+    db.session.commit()
+    content_cache.invalidate('Certification')
+    print('Updated', updated, 'certification rows.')
@@ -0,0 +1,307 @@
+# scripts/benchmark.py
+# Load-test the app against a throwaway SQLite database and compare with a saved baseline.
+#
+#   python scripts/benchmark.py --scale 20 --save-baseline bench_baseline.json
+#   python scripts/benchmark.py --scale 20 --baseline bench_baseline.json   # exits 1 on regression
+#
+# The database is filled from data/resume_data.json and then padded with
+# synthetic projects, skills and certifications (`--scale` x 100 each).
+# Requests go through Flask's test client from `--concurrency` threads, so
+# the numbers measure the app itself (routing, caches, SQL, Jinja), not a
+# WSGI server. Upload endpoints are left out because they write into
+# static/.
+#
+# With --url the same public routes are sent over HTTP keep-alive
+# connections to an already running server instead, to compare gunicorn
+# worker profiles (see gunicorn.conf.py):
+#
+#   GUNICORN_WORKER_CLASS=sync gunicorn -c gunicorn.conf.py &
+#   python scripts/benchmark.py --url http://127.0.0.1:8000 --concurrency 64
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
+
+base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Add project root to the Python path
+sys.path.append(base)
+
+ADMIN_USER = 'bench'
+ADMIN_PASSWORD = 'bench-password'
+
+# name, method, path, request kwargs, needs an admin session
+SCENARIOS = (
+    ('home', 'GET', '/', {}, False),
+    ('projects', 'GET', '/projects', {}, False),
+    ('projects_api', 'GET', '/api/projects?limit=50', {}, False),
+    ('technical_skills', 'GET', '/technical-skills', {}, False),
+    ('certifications', 'GET', '/certifications', {}, False),
+    ('search', 'GET', '/api/search?q=pyth', {}, False),
+    ('download_resume', 'GET', '/download_resume', {}, False),
+    ('admin_login', 'POST', '/admin/login', {'data': {'username': ADMIN_USER, 'password': ADMIN_PASSWORD}}, False),
+    ('admin_dashboard', 'GET', '/admin/dashboard', {}, True),
+    ('admin_jobs', 'GET', '/admin/jobs', {}, True),
+    ('admin_bulk_export', 'GET', '/admin/bulk?model=Skill', {}, True),
+    ('admin_add_project', 'POST', '/admin/add_project',
+     {'json': {'title': 'Benchmark project', 'description': 'Added by scripts/benchmark.py', 'link': ''}}, True),
+    ('admin_add_experience', 'POST', '/admin/add_experience',
+     {'json': {'company': 'BENCH', 'role': 'Load tester', 'duration': '', 'responsibilities': ['requests']}}, True),
+    # the same adds, BATCH_ITEMS per request in one transaction
+    ('admin_add_project_batch', 'POST', '/admin/add_project',
+     {'json': [{'title': 'Benchmark project %d' % i, 'description': 'Added by scripts/benchmark.py', 'link': ''}
+               for i in range(20)]}, True),
+    ('admin_add_experience_batch', 'POST', '/admin/add_experience',
+     {'json': [{'company': 'BENCH', 'role': 'Load tester %d' % i, 'duration': '', 'responsibilities': ['requests']}
+               for i in range(20)]}, True),
+)
+
+# batched scenario -> (one-item scenario it replaces, items per request)
+BATCHES = {
+    'admin_add_project_batch': ('admin_add_project', 20),
+    'admin_add_experience_batch': ('admin_add_experience', 20),
+}
+
+
+def isolate_environment(args):
+    """Points the app at throwaway storage; must run before `app` is imported."""
+    tmp = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+    os.environ['JOBS_DB_PATH'] = os.path.join(tmp, 'jobs.sqlite3')
+    os.environ['CONTENT_VERSION_FILE'] = os.path.join(tmp, 'content_version')
+    os.environ['RESUME_AUTO_SYNC'] = 'false'
+    # every admin client thread logs in once; don't let the login rate limits turn them away
+    os.environ['LOGIN_RATE_LIMIT_IP'] = os.environ['LOGIN_RATE_LIMIT_USER'] = '100000/60'
+    if args.no_page_cache:
+        os.environ['PAGE_CACHE_ENABLED'] = 'false'
+    return tmp
+
+
+def populate(app, scale):
+    from sqlalchemy import insert
+    from bulk_sync import sync_resume_data
+    from models import db, User, Project, Skill, Certification
+
+    with app.app_context():
+        db.create_all()
+        user = User(username=ADMIN_USER)
+        user.set_password(ADMIN_PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+        with open(os.path.join(base, 'data', 'resume_data.json'), 'r', encoding='utf-8') as f:
+            sync_resume_data(db.engine, json.load(f))
+
+        n = scale * 100
+        with db.engine.begin() as conn:
+            conn.execute(insert(Project.__table__), [
+                {'title': 'Synthetic project %d' % i,
+                 'description': 'Built a python flask service\nIndexed %d records' % i,
+                 'link': 'https://example.com/p/%d' % i} for i in range(n)])
+            conn.execute(insert(Skill.__table__), [
+                {'category': 'synthetic_%d' % (i % 12), 'name': 'Skill %d' % i} for i in range(n)])
+            conn.execute(insert(Certification.__table__), [
+                {'title': 'Synthetic certification %d' % i, 'organization': 'Org %d' % (i % 40),
+                 'year': str(2000 + i % 25)} for i in range(n)])
+
+
+def percentile(sorted_values, pct):
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class HTTPResponse:
+    __slots__ = ('status_code', 'data')
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+
+class HTTPClient:
+    """Just enough of the test client's open() over one keep-alive connection."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.factory = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.conn = self.factory(self.netloc, timeout=60)
+
+    def open(self, path, method='GET', **kwargs):
+        try:
+            self.conn.request(method, self.prefix + path)
+            response = self.conn.getresponse()
+            return HTTPResponse(response.status, response.read())
+        except (OSError, HTTPException):
+            # counted as an error; reconnect for the next request
+            self.conn.close()
+            self.conn = self.factory(self.netloc, timeout=60)
+            return HTTPResponse(599, b'')
+
+
+def make_client(app, admin):
+    if isinstance(app, str):
+        return HTTPClient(app)
+    client = app.test_client()
+    if admin:
+        response = client.post('/admin/login', data={'username': ADMIN_USER, 'password': ADMIN_PASSWORD})
+        if response.status_code >= 400:
+            raise SystemExit('benchmark admin login failed (%d)' % response.status_code)
+    return client
+
+
+def run_scenario(app, scenario, requests, concurrency):
+    # app is the Flask app, or a base URL string with --url
+    name, method, path, kwargs, admin = scenario
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+    # clients log in before the clock starts; bcrypt would otherwise dominate admin numbers
+    clients = [None if name == 'admin_login' else make_client(app, admin) for n in per_worker if n]
+
+    def worker(job):
+        client, count = job
+        latencies, errors = [], 0
+        for _ in range(count):
+            # a logged-in client is redirected without checking the password; log in fresh each time
+            c = client or make_client(app, False)
+            start = time.perf_counter()
+            response = c.open(path, method=method, **kwargs)
+            response.get_data()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+        return latencies, errors
+
+    # warm-up so the first request's cache fill isn't in the percentiles
+    make_client(app, admin).open(path, method=method, **kwargs)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, zip(clients, [n for n in per_worker if n])))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(l for worker_latencies, _ in results for l in worker_latencies)
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms=1.0):
+    """
+    Returns a list of regression messages: p95 up or throughput down by
+    more than threshold. p95 changes under min_delta_ms are scheduler
+    noise on sub-millisecond routes and never count.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if (before['p95_ms'] and result['p95_ms'] > before['p95_ms'] * (1 + threshold)
+                and result['p95_ms'] - before['p95_ms'] >= min_delta_ms):
+            regressions.append('%s: p95 %.2f ms -> %.2f ms' % (name, before['p95_ms'], result['p95_ms']))
+        if before['rps'] and result['rps'] < before['rps'] * (1 - threshold):
+            regressions.append('%s: throughput %.1f -> %.1f req/s' % (name, before['rps'], result['rps']))
+    return regressions
+
+
+def print_report(results, baseline=None):
+    print('%-26s %7s %6s %9s %9s %9s %9s %10s' % (
+        'scenario', 'reqs', 'errors', 'p50 ms', 'p95 ms', 'p99 ms', 'req/s', 'vs base'))
+    for name, r in results.items():
+        delta = ''
+        before = (baseline or {}).get(name)
+        if before and before['p95_ms']:
+            delta = '%+.0f%% p95' % ((r['p95_ms'] / before['p95_ms'] - 1) * 100)
+        print('%-26s %7d %6d %9.2f %9.2f %9.2f %9.1f %10s' % (
+            name, r['requests'], r['errors'], r['p50_ms'], r['p95_ms'], r['p99_ms'], r['rps'], delta))
+
+
+def print_batch_comparison(results):
+    """Per-item cost of the batched add scenarios next to one request per item."""
+    pairs = [(name, single, items) for name, (single, items) in BATCHES.items() if name in results and single in results]
+    if not pairs:
+        return
+    print('\n%-22s %14s %14s %9s' % ('per item', 'single ms', 'batched ms', 'speedup'))
+    for name, single, items in pairs:
+        one, many = results[single]['p50_ms'], results[name]['p50_ms'] / items
+        print('%-22s %14.3f %14.3f %8.1fx' % (single, one, many, one / many if many else 0.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the portfolio app.')
+    parser.add_argument('--scale', type=int, default=10, help='synthetic rows per table, in hundreds')
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--only', help='comma-separated scenario names')
+    parser.add_argument('--url', help='benchmark a running server at this base URL instead of the test client')
+    parser.add_argument('--no-page-cache', action='store_true', help='measure with PAGE_CACHE_ENABLED=false')
+    parser.add_argument('--baseline', help='JSON file from --save-baseline to compare against')
+    parser.add_argument('--save-baseline', help='write results to this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression (0.2 = 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore p95 changes smaller than this')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        # a real server keeps CSRF on, so only the public routes are driven
+        app = args.url
+        scenarios = [s for s in SCENARIOS if not s[2].startswith('/admin/')]
+    else:
+        isolate_environment(args)
+        from app import create_app
+        app = create_app()
+        # the harness drives the JSON admin API directly, without the dashboard's CSRF token
+        app.config['WTF_CSRF_ENABLED'] = False
+
+        start = time.perf_counter()
+        populate(app, args.scale)
+        print('Populated %d synthetic rows per table in %.1f s' % (args.scale * 100, time.perf_counter() - start))
+        scenarios = SCENARIOS
+
+    only = set(args.only.split(',')) if args.only else None
+    results = {}
+    for scenario in scenarios:
+        if only and scenario[0] not in only:
+            continue
+        results[scenario[0]] = run_scenario(app, scenario, args.requests, args.concurrency)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+    print_batch_comparison(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'url': args.url, 'scale': args.scale, 'requests': args.requests, 'concurrency': args.concurrency,
+                       'page_cache': not args.no_page_cache, 'results': results}, f, indent=2)
+        print('Saved baseline to', args.save_baseline)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for message in regressions:
+            print('REGRESSION', message)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# scripts/benchmark_startup.py
+# Measure cold-start time: importing app.py, building the app and serving the first request.
+#
+#   python scripts/benchmark_startup.py --runs 10 --save-baseline startup_baseline.json
+#   python scripts/benchmark_startup.py --baseline startup_baseline.json   # exits 1 on regression
+#
+# Every run is a fresh interpreter, so nothing is already in sys.modules and
+# the numbers are what a gunicorn worker, `flask` command or script pays
+# before doing any work. The app talks to an empty throwaway SQLite database.
+# --importtime prints the slowest imports of one extra run (python -X importtime).
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints {phase: seconds} as JSON
+PROBE = r'''
+import json, sys, time
+start = time.perf_counter()
+import app as appmod
+timings = {'import': time.perf_counter() - start}
+mark = time.perf_counter()
+app = appmod.create_app(blueprints=%(blueprints)r)
+timings['create_app'] = time.perf_counter() - mark
+if %(request)r:
+    from models import db
+    with app.app_context():
+        db.create_all()
+    mark = time.perf_counter()
+    app.test_client().get(%(request)r)
+    timings['first_request'] = time.perf_counter() - mark
+timings['total'] = time.perf_counter() - start
+sys.stdout.write(json.dumps(timings))
+'''
+
+# name, blueprints to register, path of the first request (None for no request)
+SCENARIOS = (
+    ('script', (), None),
+    ('web', ('public', 'api', 'admin'), None),
+    ('web_first_request', ('public', 'api', 'admin'), '/'),
+)
+
+
+def child_env(db_path):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = 'sqlite:///' + db_path
+    # keep a stray `flask run` setting from changing what gets imported
+    env.pop('FLASK_APP', None)
+    return env
+
+
+def run_once(scenario, env):
+    name, blueprints, path = scenario
+    code = PROBE % {'blueprints': tuple(blueprints), 'request': path}
+    out = subprocess.run([sys.executable, '-c', code], cwd=base, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def run_scenario(scenario, runs, env):
+    samples = [run_once(scenario, env) for _ in range(runs)]
+    return {phase: round(statistics.median(s[phase] for s in samples) * 1000, 1) for phase in samples[0]}
+
+
+def print_importtime(env, limit=15):
+    """Prints the imports with the largest cumulative time when importing app.py."""
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=base, env=env,
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    print('\n%-40s %10s' % ('import (cumulative)', 'ms'))
+    for cumulative, module in sorted(rows, reverse=True)[:limit]:
+        print('%-40s %10.1f' % (module, cumulative / 1000))
+
+
+def compare(results, baseline, threshold, min_delta_ms=5.0):
+    """Returns a regression message for every total that grew by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if (result['total'] > before['total'] * (1 + threshold)
+                and result['total'] - before['total'] >= min_delta_ms):
+            regressions.append('%s: %.1f ms -> %.1f ms' % (name, before['total'], result['total']))
+    return regressions
+
+
+def print_report(results, baseline=None):
+    print('%-20s %9s %11s %14s %9s %10s' % ('scenario', 'import', 'create_app', 'first request', 'total', 'vs base'))
+    for name, r in results.items():
+        delta = ''
+        before = (baseline or {}).get(name)
+        if before and before['total']:
+            delta = '%+.0f%%' % ((r['total'] / before['total'] - 1) * 100)
+        first = '%.1f' % r['first_request'] if 'first_request' in r else '-'
+        print('%-20s %9.1f %11.1f %14s %9.1f %10s' % (name, r['import'], r['create_app'], first, r['total'], delta))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark cold-start time of the portfolio app.')
+    parser.add_argument('--runs', type=int, default=7, help='fresh interpreters per scenario (the median is reported)')
+    parser.add_argument('--importtime', action='store_true', help='also list the slowest imports')
+    parser.add_argument('--baseline', help='JSON file from --save-baseline to compare against')
+    parser.add_argument('--save-baseline', help='write results to this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression (0.2 = 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='ignore changes smaller than this')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = child_env(os.path.join(tmp, 'startup.db'))
+        results = {s[0]: run_scenario(s, args.runs, env) for s in SCENARIOS}
+        if args.importtime:
+            print_importtime(env)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'python': sys.version.split()[0], 'results': results}, f, indent=2)
+        print('Saved baseline to', args.save_baseline)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for message in regressions:
+            print('REGRESSION', message)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
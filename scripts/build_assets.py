@@ -0,0 +1,14 @@
+# scripts/build_assets.py
+# Minify, fingerprint and precompress static/css and static/js into static/dist
+import os
+import sys
+
+# Add project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from assets import build
+
+base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+manifest = build(os.path.join(base, 'static'))
+for source, hashed in sorted(manifest.items()):
+    print(source, '->', hashed)
+print('Wrote', len(manifest), 'assets')
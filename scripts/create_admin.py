@@ -7,12 +7,14 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from getpass import getpass
-from app import app
+from app import create_app
 from models import db, User
 
 def main():
     username = os.getenv('ADMIN_USER') or input('Admin username: ')
     password = os.getenv('ADMIN_PASSWORD') or getpass('Admin password: ')
+    # no blueprints: this only needs the database
+    app = create_app(blueprints=())
     with app.app_context():
         user = User.query.filter_by(username=username).first()
         if user:
@@ -0,0 +1,50 @@
+# scripts/gc_uploads.py
+# Remove uploaded certificate images that no Certification row refers to.
+#
+#   python scripts/gc_uploads.py            # list what would be removed
+#   python scripts/gc_uploads.py --delete   # remove it
+#
+# Files are only removed once they are older than UPLOAD_GC_GRACE_SECONDS
+# (--grace overrides it), so an upload whose row is still being committed
+# is never collected. Thumbnails and WebP variants go with their original.
+import argparse
+import os
+import sys
+
+# Add project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import create_app
+from extensions import upload_storage
+from models import db, Certification
+
+
+def reference_counts():
+    """{image_file: number of certifications using it}."""
+    rows = db.session.execute(
+        db.select(Certification.image_file, db.func.count())
+        .where(Certification.image_file.isnot(None))
+        .group_by(Certification.image_file)
+    )
+    return dict(rows.all())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Garbage-collect unreferenced uploads.')
+    parser.add_argument('--delete', action='store_true', help='actually remove the files')
+    parser.add_argument('--grace', type=int, help='seconds an unreferenced file is kept (default UPLOAD_GC_GRACE_SECONDS)')
+    args = parser.parse_args(argv)
+
+    app = create_app(blueprints=())
+    with app.app_context():
+        counts = reference_counts()
+        shared = sum(1 for n in counts.values() if n > 1)
+        print('%d images referenced by %d certifications (%d shared)' % (len(counts), sum(counts.values()), shared))
+        grace = app.config['UPLOAD_GC_GRACE_SECONDS'] if args.grace is None else args.grace
+        removed = upload_storage.collect_garbage('certs', set(counts), grace_seconds=grace, dry_run=not args.delete)
+    for key in removed:
+        print('removed' if args.delete else 'unreferenced', key)
+    print('%d files %s.' % (len(removed), 'removed' if args.delete else 'would be removed (pass --delete)'))
+
+
+if __name__ == '__main__':
+    main()
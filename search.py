@@ -0,0 +1,184 @@
+import re
+import threading
+from bisect import bisect_left
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+# query terms shorter than this only match exactly or by prefix
+FUZZY_MIN_LENGTH = 4
+MAX_QUERY_TERMS = 8
+
+# match kind -> score multiplier
+EXACT, PREFIX, FUZZY = 3, 2, 1
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower()) if text else []
+
+
+def _deletes(token):
+    """Every string one deletion away from token (symmetric-delete typo matching)."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_text(v) for v in value)
+    return str(value)
+
+
+def _field(item, name):
+    # snapshot rows are mappings; fallback JSON rows may be plain strings
+    if isinstance(item, str):
+        return item if name in ('title', 'name') else ''
+    return item.get(name)
+
+
+def _project_docs(projects):
+    for p in projects:
+        yield {'title': _text(_field(p, 'title')), 'text': _text(_field(p, 'description')),
+               'link': _field(p, 'link') or None}
+
+
+def _experience_docs(experiences):
+    for e in experiences:
+        company, role = _text(_field(e, 'company')), _text(_field(e, 'role'))
+        # fallback JSON has free-text 'details' instead of a responsibilities list
+        body = _field(e, 'responsibilities') or _field(e, 'details')
+        yield {'title': ' — '.join(x for x in (company, role) if x), 'text': _text(body), 'link': None}
+
+
+def _skill_docs(skills):
+    for category, items in skills.items():
+        for s in items:
+            yield {'title': _text(_field(s, 'name')), 'text': category.replace('_', ' '), 'link': None}
+
+
+def _certification_docs(certs):
+    for c in certs:
+        yield {'title': _text(_field(c, 'title')), 'text': _text(_field(c, 'organization')), 'link': None}
+
+
+# section -> (snapshot attribute, endpoint of the page listing it, document builder)
+SECTIONS = {
+    'Project': ('projects', 'public.projects', _project_docs),
+    'Experience': ('experience', 'public.professional', _experience_docs),
+    'Skill': ('skills', 'public.technical_skills', _skill_docs),
+    'Certification': ('certifications', 'public.certifications', _certification_docs),
+}
+
+# field -> weight; a hit in the title counts double
+FIELDS = {'title': 2, 'text': 1}
+
+
+class _SectionIndex:
+    """Inverted index over one section's documents. Built once, then read-only."""
+
+    __slots__ = ('source', 'docs', 'postings', 'vocab', 'deletes')
+
+    def __init__(self, source, docs):
+        self.source = source
+        self.docs = docs
+        # token -> {doc index: field weight}
+        self.postings = {}
+        for i, doc in enumerate(docs):
+            for field, weight in FIELDS.items():
+                for token in tokenize(doc[field]):
+                    hits = self.postings.setdefault(token, {})
+                    hits[i] = max(hits.get(i, 0), weight)
+        self.vocab = sorted(self.postings)
+        self.deletes = {}
+        for token in self.vocab:
+            if len(token) >= FUZZY_MIN_LENGTH:
+                for variant in _deletes(token) | {token}:
+                    self.deletes.setdefault(variant, []).append(token)
+
+    def _expand(self, term):
+        """Returns {indexed token: match kind} for a query term."""
+        matches = {}
+        # prefix: a contiguous run of the sorted vocabulary
+        i = bisect_left(self.vocab, term)
+        while i < len(self.vocab) and self.vocab[i].startswith(term):
+            token = self.vocab[i]
+            matches[token] = EXACT if token == term else PREFIX
+            i += 1
+        if len(term) >= FUZZY_MIN_LENGTH:
+            for variant in _deletes(term) | {term}:
+                for token in self.deletes.get(variant, ()):
+                    matches.setdefault(token, FUZZY)
+        return matches
+
+    def search(self, terms):
+        """Returns {doc index: score} for documents matching every term."""
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token, kind in self._expand(term).items():
+                for doc, weight in self.postings[token].items():
+                    term_scores[doc] = max(term_scores.get(doc, 0), kind * weight)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+
+class SearchIndex:
+    """
+    In-process search over the portfolio snapshot.
+
+    Each section has its own inverted index, with a sorted vocabulary for
+    prefix matches and a delete-variant table for one-typo matches, so a
+    lookup is a handful of dict probes. refresh() is called with the
+    current snapshot before each search; when the content version has
+    changed only the sections whose data differs are re-indexed, so an
+    admin adding a project doesn't re-tokenize the skills.
+    """
+
+    def __init__(self):
+        self._sections = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def refresh(self, snapshot):
+        if snapshot.version == self._version:
+            return
+        with self._lock:
+            if snapshot.version == self._version:
+                return
+            sections = dict(self._sections)
+            for name, (attr, _, build_docs) in SECTIONS.items():
+                source = getattr(snapshot, attr)
+                current = sections.get(name)
+                if current is None or current.source != source:
+                    sections[name] = _SectionIndex(source, list(build_docs(source)))
+                    self.rebuilds += 1
+            # swapped in whole; searches in flight keep the old dict
+            self._sections = sections
+            # fallback data isn't tied to the version: rebuild from the DB once it is back
+            self._version = snapshot.version if snapshot.db_available else None
+
+    def search(self, query, limit=20, sections=None):
+        """
+        Returns up to `limit` results as {'section', 'endpoint', 'title',
+        'text', 'link', 'score'}, best first. Every query term must match.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+        results = []
+        for name, index in self._sections.items():
+            if sections and name not in sections:
+                continue
+            endpoint = SECTIONS[name][1]
+            for doc, score in index.search(terms).items():
+                results.append(dict(index.docs[doc], section=name, endpoint=endpoint, score=score))
+        results.sort(key=lambda r: (-r['score'], r['section'], r['title']))
+        return results[:limit]
@@ -0,0 +1,233 @@
+import secrets
+import threading
+from datetime import datetime, timedelta
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from sqlalchemy import delete, insert, select, update
+from werkzeug.datastructures import CallbackDict
+
+from content_cache import LocalCacheBackend, _MISSING
+
+# expired rows are swept from the SQL table once every this many session writes
+SQL_SWEEP_EVERY = 200
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data kept on the server; the cookie only carries `sid`."""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.stale_sid = None
+        # set when the backend couldn't be read: the session is never written back
+        self.unavailable = False
+
+    def regenerate(self):
+        """Moves the data to a fresh id (call on login, so a planted cookie never gets privileges)."""
+        if not self.new:
+            self.stale_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.new = True
+        self.modified = True
+
+
+class MemorySessionBackend:
+    """Per-process LRU. Only for a single worker process: other workers can't see the sessions."""
+
+    def __init__(self, max_entries=10000):
+        self.cache = LocalCacheBackend(max_entries=max_entries)
+
+    def load(self, sid):
+        value = self.cache.get(sid)
+        return None if value is _MISSING else value
+
+    def save(self, sid, data, ttl):
+        self.cache.set(sid, data, ttl=ttl)
+
+    def delete(self, sid):
+        self.cache.delete(sid)
+
+
+class SqlSessionBackend:
+    """
+    Sessions in the server_session table, shared by every worker. Uses the
+    engine directly so saving a session never commits (or rolls back)
+    whatever the view left in db.session. Every statement goes through
+    the database circuit breaker, so an outage fails fast here too.
+    """
+
+    def __init__(self, db, table, breaker=None):
+        self.db = db
+        self.table = table
+        self.breaker = breaker
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _call(self, func):
+        return self.breaker.call(func) if self.breaker is not None else func()
+
+    def load(self, sid):
+        t = self.table
+
+        def load():
+            with self.db.engine.connect() as conn:
+                return conn.execute(
+                    select(t.c.data).where(t.c.id == sid, t.c.expires_at > datetime.utcnow())
+                ).scalar()
+        return self._call(load)
+
+    def save(self, sid, data, ttl):
+        t = self.table
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+
+        def save():
+            with self.db.engine.begin() as conn:
+                if not conn.execute(update(t).where(t.c.id == sid).values(data=data, expires_at=expires_at)).rowcount:
+                    conn.execute(insert(t).values(id=sid, data=data, expires_at=expires_at))
+        self._call(save)
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % SQL_SWEEP_EVERY == 0
+        if sweep:
+            self.sweep()
+
+    def delete(self, sid):
+        def delete_row():
+            with self.db.engine.begin() as conn:
+                conn.execute(delete(self.table).where(self.table.c.id == sid))
+        self._call(delete_row)
+
+    def sweep(self):
+        def sweep():
+            with self.db.engine.begin() as conn:
+                return conn.execute(delete(self.table).where(self.table.c.expires_at <= datetime.utcnow())).rowcount
+        return self._call(sweep)
+
+
+class ServerSessionInterface(SessionInterface):
+    """
+    Flask session interface over a server-side backend.
+
+    The cookie holds a signed random id and is only sent when the id
+    changes, so requests no longer re-serialize and re-sign the whole
+    session on the way out. Data is encoded with Flask's tagged JSON
+    serializer (the same one cookie sessions use) and is only written
+    back when the view changed it. Visitors who never put anything in the
+    session never get a cookie or a backend entry.
+
+    If the backend raises one of `errors` (the database is down), the
+    request carries on with an empty session that is never saved and
+    keeps the visitor's cookie, so they are logged in again once the
+    backend is back.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, backend, errors=()):
+        self.backend = backend
+        self.errors = errors
+        self.loads = 0
+        self.saves = 0
+        self.failures = 0
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-session')
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            if sid:
+                self.loads += 1
+                try:
+                    raw = self.backend.load(sid)
+                except self.errors:
+                    self.failures += 1
+                    session = ServerSession(sid=sid)
+                    session.unavailable = True
+                    return session
+                if raw is not None:
+                    return ServerSession(self.serializer.loads(raw), sid=sid)
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        if session.unavailable:
+            return
+        try:
+            self._save_session(app, session, response)
+        except self.errors:
+            # the response still goes out; whatever the view put in the session is lost
+            self.failures += 1
+
+    def _save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.stale_sid:
+            self.backend.delete(session.stale_sid)
+        if not session:
+            if session.modified and not session.new:
+                # emptied (logout): forget it on both ends
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app), httponly=self.get_cookie_httponly(app),
+                                       samesite=self.get_cookie_samesite(app))
+            return
+        if session.accessed:
+            response.vary.add('Cookie')
+        if session.modified:
+            self.saves += 1
+            ttl = int(app.permanent_session_lifetime.total_seconds())
+            self.backend.save(session.sid, self.serializer.dumps(dict(session)), ttl)
+        if session.new:
+            response.set_cookie(
+                name, self._signer(app).sign(session.sid).decode(),
+                expires=self.get_expiration_time(app, session), httponly=self.get_cookie_httponly(app),
+                domain=domain, path=path, secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+    def stats(self):
+        return {'loads': self.loads, 'saves': self.saves, 'failures': self.failures}
+
+
+class ServerSessions:
+    """Installs ServerSessionInterface on the app unless SESSION_BACKEND is 'cookie'."""
+
+    def __init__(self, app=None, db=None, table=None, breaker=None, errors=()):
+        self.db = db
+        self.table = table
+        self.breaker = breaker
+        self.errors = errors
+        self.interface = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config['SESSION_BACKEND']
+        if backend == 'cookie':
+            self.interface = None
+            return
+        if backend == 'sql':
+            store = SqlSessionBackend(self.db, self.table, breaker=self.breaker)
+        elif backend == 'memory':
+            store = MemorySessionBackend(max_entries=app.config['SESSION_MAX_ENTRIES'])
+        else:
+            raise ValueError('Unknown SESSION_BACKEND %r' % backend)
+        self.interface = ServerSessionInterface(store, errors=self.errors)
+        app.session_interface = self.interface
+        app.extensions['server_sessions'] = self
+
+    def stats(self):
+        return self.interface.stats() if self.interface is not None else {}
@@ -0,0 +1,157 @@
+import threading
+import time
+from types import MappingProxyType
+
+from models import db, Skill
+from pagination import ordered
+
+
+def _load_skills():
+    return {
+        category: [s.to_dict() for s in items]
+        for category, items in Skill.get_skills_by_category().items()
+    }
+
+
+# content cache key -> loader returning plain (picklable) data
+SECTION_LOADERS = {
+    'Education': lambda: [e.to_dict() for e in ordered('Education')],
+    'Experience': lambda: [e.to_dict() for e in ordered('Experience')],
+    'Project': lambda: [p.to_dict() for p in ordered('Project')],
+    'Certification': lambda: [c.to_dict() for c in ordered('Certification')],
+    'Skill': _load_skills,
+    'Achievement': lambda: [a.to_dict() for a in ordered('Achievement')],
+}
+
+# content cache key -> (snapshot attribute, resume_data.json key used as fallback)
+SECTIONS = {
+    'Education': ('education', 'education'),
+    'Experience': ('experience', 'professional_experience'),
+    'Project': ('projects', 'projects'),
+    'Certification': ('certifications', 'certifications'),
+    'Skill': ('skills', 'technical_skills'),
+    'Achievement': ('achievements', 'achievements'),
+}
+
+
+def _freeze(value):
+    """Read-only copy of JSON-like data: dicts become mappingproxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Plain (JSON-serializable) copy of data frozen by _freeze."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+class PortfolioSnapshot:
+    """Immutable view of every portfolio section for one content version."""
+
+    __slots__ = ('version', 'db_available', 'resume', 'profile', 'contact',
+                 'education', 'experience', 'projects', 'certifications',
+                 'skills', 'achievements')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('PortfolioSnapshot is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('PortfolioSnapshot is immutable')
+
+
+class SnapshotService:
+    """
+    Builds and memoizes the PortfolioSnapshot used by every public page.
+
+    Sections already in the content cache are reused; the missing ones are
+    queried together on a single pooled connection inside one transaction,
+    guarded by the DB circuit breaker. Empty or unavailable sections fall
+    back to resume_data.json exactly like the routes used to do one by one.
+    """
+
+    def __init__(self, content_cache, resume_store, breaker, db_errors, ttl=300):
+        self.content_cache = content_cache
+        self.resume_store = resume_store
+        self.breaker = breaker
+        self.db_errors = db_errors
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._built_at = 0.0
+        self.builds = 0
+
+    def init_app(self, app):
+        self.ttl = app.config['CONTENT_CACHE_TTL']
+        app.extensions['snapshot'] = self
+
+    def _version(self):
+        return '%s.%s' % (self.content_cache.version, self.resume_store.version)
+
+    def _query_sections(self, keys):
+        # one session -> one connection checkout and one transaction for all sections
+        try:
+            return {key: SECTION_LOADERS[key]() for key in keys}
+        finally:
+            db.session.rollback()
+
+    def _load_sections(self):
+        sections = self.content_cache.get_many(SECTION_LOADERS)
+        missing = [key for key in SECTION_LOADERS if key not in sections]
+        if missing:
+            loaded = self.breaker.call(lambda: self._query_sections(missing))
+            for key, value in loaded.items():
+                self.content_cache.set(key, value)
+            sections.update(loaded)
+        return sections
+
+    def _build(self, version):
+        data = self.resume_store.get()
+        try:
+            sections = self._load_sections()
+            db_available = True
+        except self.db_errors:
+            sections = {}
+            db_available = False
+
+        fields = {
+            'version': version,
+            'db_available': db_available,
+            'resume': _freeze(data),
+            'profile': data.get('summary', ''),
+            'contact': _freeze({'name': data.get('name'), 'email': data.get('email'),
+                                'phone': data.get('phone'), 'linkedin': data.get('linkedin')}),
+        }
+        for key, (attr, fallback_key) in SECTIONS.items():
+            value = sections.get(key)
+            if not value:
+                value = data.get(fallback_key) or ({} if key == 'Skill' else [])
+            fields[attr] = _freeze(value)
+        self.builds += 1
+        return PortfolioSnapshot(**fields)
+
+    def get(self):
+        version = self._version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version and time.monotonic() - self._built_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == version and time.monotonic() - self._built_at < self.ttl:
+                return snapshot
+            snapshot = self._build(version)
+            # a fallback snapshot is not memoized, so recovery is picked up on the next request
+            if snapshot.db_available:
+                self._snapshot = snapshot
+                self._built_at = time.monotonic()
+            return snapshot
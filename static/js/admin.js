@@ -36,6 +36,35 @@ document.addEventListener('DOMContentLoaded', function() {
     // --- AJAX Form Submission for Experience and Project ---
     const csrfToken = document.getElementById('csrf_token').value;
 
+    // Write-behind batching: adds queued within BATCH_WINDOW_MS of each other go out as one
+    // request (a JSON list, inserted in one transaction); each caller gets its own item's result.
+    const BATCH_WINDOW_MS = 50;
+    const makeBatcher = url => {
+        let queue = [];
+        const flush = () => {
+            const batch = queue;
+            queue = [];
+            const single = batch.length === 1;
+            fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+                body: JSON.stringify(single ? batch[0].item : batch.map(entry => entry.item))
+            })
+            .then(res => res.json())
+            .then(result => batch.forEach((entry, i) => {
+                const item = single || !result.results ? result : result.results[i];
+                entry.resolve({ success: item.success, message: item.message || result.message });
+            }))
+            .catch(error => batch.forEach(entry => entry.reject(error)));
+        };
+        return item => new Promise((resolve, reject) => {
+            if (queue.length === 0) setTimeout(flush, BATCH_WINDOW_MS);
+            queue.push({ item, resolve, reject });
+        });
+    };
+    const addExperience = makeBatcher('/admin/add_experience');
+    const addProject = makeBatcher('/admin/add_project');
+
     // Handle Experience Form
     const expForm = document.getElementById('form-experience');
     if (expForm) {
@@ -48,17 +77,13 @@ document.addEventListener('DOMContentLoaded', function() {
                 duration: formData.get('duration'),
                 responsibilities: formData.get('responsibilities').split('\n').filter(line => line.trim() !== '')
             };
-            
-            fetch('/admin/add_experience', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
-                body: JSON.stringify(data)
-            })
-            .then(res => res.json())
+
+            addExperience(data)
             .then(result => {
                 alert(result.message);
                 if (result.success) this.reset();
-            });
+            })
+            .catch(error => console.error('Error:', error));
         });
     }
 
@@ -70,16 +95,12 @@ document.addEventListener('DOMContentLoaded', function() {
             const formData = new FormData(this);
             const data = Object.fromEntries(formData.entries());
 
-            fetch('/admin/add_project', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
-                body: JSON.stringify(data)
-            })
-            .then(res => res.json())
+            addProject(data)
             .then(result => {
                 alert(result.message);
                 if (result.success) this.reset();
-            });
+            })
+            .catch(error => console.error('Error:', error));
         });
     }
 
@@ -104,6 +125,48 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // --- Background Jobs Table ---
+    const jobsTable = document.getElementById('jobs-table');
+    let jobsTimer = null;
+
+    const describeJob = job => {
+        if (job.status === 'failed') return (job.error || '').split('\n').filter(l => l.trim()).pop() || 'Failed';
+        if (job.status !== 'done' || !job.result) return '';
+        const sync = job.result.sync || {};
+        return Object.entries(sync)
+            .filter(([, r]) => r.inserted || r.updated)
+            .map(([name, r]) => `${name}: +${r.inserted} ~${r.updated}`)
+            .join(', ') || 'No changes';
+    };
+
+    function refreshJobs() {
+        if (!jobsTable) return;
+        fetch('/admin/jobs')
+            .then(res => res.json())
+            .then(result => {
+                if (!result.success) return;
+                jobsTable.innerHTML = '';
+                if (result.jobs.length === 0) {
+                    jobsTable.innerHTML = '<tr><td colspan="4" class="text-muted">No jobs yet.</td></tr>';
+                }
+                result.jobs.forEach(job => {
+                    const row = document.createElement('tr');
+                    [job.kind, job.status, new Date(job.created_at * 1000).toLocaleString(), describeJob(job)].forEach(text => {
+                        const cell = document.createElement('td');
+                        cell.textContent = text;
+                        row.appendChild(cell);
+                    });
+                    jobsTable.appendChild(row);
+                });
+                // keep polling only while something is still in progress
+                const active = result.jobs.some(job => job.status === 'queued' || job.status === 'running');
+                clearTimeout(jobsTimer);
+                if (active) jobsTimer = setTimeout(refreshJobs, 3000);
+            })
+            .catch(error => console.error('Error:', error));
+    }
+    refreshJobs();
+
     // Handle Resume Upload Form
     const resumeForm = document.getElementById('form-resume');
     if (resumeForm) {
@@ -120,6 +183,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(result => {
                 alert(result.message); // Use alert to show feedback
                 if (result.success) this.reset();
+                if (result.job_id) refreshJobs();
             })
             .catch(error => console.error('Error:', error));
         });
@@ -0,0 +1,354 @@
+import io
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from flask import Response, abort, url_for
+
+from uploads import CHUNK_SIZE, save_upload
+
+MIMETYPES = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'gif': 'image/gif',
+             'webp': 'image/webp', 'pdf': 'application/pdf'}
+
+
+class LocalStorage:
+    """
+    Blobs as files under root (UPLOAD_FOLDER); key 'certs/ab12.png' is
+    root/certs/ab12.png. When root is inside the static folder, URLs point
+    at the static route so the front-end server can serve the files.
+    """
+
+    def __init__(self, root, static_prefix=None):
+        self.root = root
+        self.static_prefix = static_prefix
+
+    def _path(self, key):
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError('key outside the storage root: %r' % key)
+        return path
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def put_file(self, key, local_path):
+        """Moves local_path into place atomically (same filesystem) or copies it."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.replace(local_path, path)
+        except OSError:
+            shutil.copyfile(local_path, path + '.tmp')
+            os.replace(path + '.tmp', path)
+
+    def touch(self, key):
+        os.utime(self._path(key))
+
+    def open(self, key):
+        return open(self._path(key), 'rb')
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self, prefix):
+        """Yields (key, modified timestamp) for every blob under prefix, leftover temp files included."""
+        base = self._path(prefix)
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, self.root).replace(os.sep, '/'), os.path.getmtime(path)
+
+    def temp_dir(self, prefix):
+        # inside the root so put_file() is a rename
+        path = self._path(prefix)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def url(self, key):
+        if self.static_prefix is not None:
+            return url_for('static', filename='%s/%s' % (self.static_prefix, key))
+        return url_for('upload', key=key)
+
+
+class InMemoryObjectClient:
+    """
+    Local stand-in for an S3-compatible client, implementing only the calls
+    ObjectStorage makes (boto3 method names and arguments). Used when no
+    UPLOAD_STORAGE_URL is configured or boto3 isn't installed.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, **extra):
+        data = Body.read() if hasattr(Body, 'read') else bytes(Body)
+        with self._lock:
+            self._objects[(Bucket, Key)] = (data, time.time(), ContentType)
+
+    def head_object(self, Bucket, Key):
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise KeyError(Key)
+        return {'ContentLength': len(entry[0]), 'LastModified': entry[1], 'ContentType': entry[2]}
+
+    def get_object(self, Bucket, Key):
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise KeyError(Key)
+        return {'Body': io.BytesIO(entry[0]), 'ContentType': entry[2]}
+
+    def copy_object(self, Bucket, Key, CopySource, **extra):
+        with self._lock:
+            data, _, content_type = self._objects[(CopySource['Bucket'], CopySource['Key'])]
+            self._objects[(Bucket, Key)] = (data, time.time(), content_type)
+
+    def delete_object(self, Bucket, Key):
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+
+    def list_objects_v2(self, Bucket, Prefix='', ContinuationToken=None):
+        with self._lock:
+            contents = [{'Key': key, 'LastModified': modified} for (bucket, key), (_, modified, _) in
+                        sorted(self._objects.items()) if bucket == Bucket and key.startswith(Prefix)]
+        return {'Contents': contents, 'IsTruncated': False}
+
+
+def make_object_client(url):
+    """
+    s3://bucket URLs get a boto3 client (endpoint from AWS_ENDPOINT_URL
+    etc.); without a URL, the in-memory stand-in. A configured bucket
+    without boto3 is an error rather than a stand-in that would keep the
+    uploads in one process and lose them on restart.
+    """
+    if not url:
+        return InMemoryObjectClient()
+    try:
+        import boto3
+    except ImportError as e:
+        raise ImportError('UPLOAD_STORAGE_URL=%s needs the boto3 package: pip install boto3' % url) from e
+    return boto3.client('s3')
+
+
+def _timestamp(value):
+    # boto3 returns datetimes, the stand-in plain floats
+    return value.timestamp() if hasattr(value, 'timestamp') else value
+
+
+class ObjectStorage:
+    """
+    Blobs in an S3-compatible bucket under an optional key prefix. Without
+    UPLOAD_PUBLIC_URL, files are served through the app's /uploads/ route.
+    """
+
+    def __init__(self, client, bucket, prefix='', public_url=None):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.public_url = public_url.rstrip('/') if public_url else None
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _metadata(key):
+        return {'ContentType': MIMETYPES.get(key.rsplit('.', 1)[-1].lower(), 'application/octet-stream'),
+                'CacheControl': 'public, max-age=31536000, immutable'}
+
+    def put_file(self, key, local_path):
+        with open(local_path, 'rb') as f:
+            self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=f, **self._metadata(key))
+        os.remove(local_path)
+
+    def touch(self, key):
+        # copying an object onto itself refreshes LastModified
+        source = {'Bucket': self.bucket, 'Key': self.prefix + key}
+        self.client.copy_object(Bucket=self.bucket, Key=self.prefix + key, CopySource=source,
+                                MetadataDirective='REPLACE', **self._metadata(key))
+
+    def open(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)['Body']
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+    def list(self, prefix):
+        kwargs = {'Bucket': self.bucket, 'Prefix': self.prefix + prefix}
+        while True:
+            page = self.client.list_objects_v2(**kwargs)
+            for item in page.get('Contents', ()):
+                yield item['Key'][len(self.prefix):], _timestamp(item['LastModified'])
+            if not page.get('IsTruncated'):
+                return
+            kwargs['ContinuationToken'] = page['NextContinuationToken']
+
+    def temp_dir(self, prefix):
+        return tempfile.gettempdir()
+
+    def url(self, key):
+        if self.public_url:
+            return '%s/%s%s' % (self.public_url, self.prefix, key)
+        return url_for('upload', key=key)
+
+
+class UploadStorage:
+    """
+    Content-addressed storage for uploaded files.
+
+    save() names every file after the SHA-256 of its bytes, so uploading
+    the same image twice stores it once: the second upload finds the blob
+    already there and just refreshes its timestamp. Rows refer to blobs
+    by name (Certification.image_file) and nothing is deleted when a row
+    goes away or a transaction rolls back; collect_garbage() removes blobs
+    that no row references once they are older than a grace period, which
+    also covers uploads whose DB commit never happened.
+
+    The backend is a directory (UPLOAD_STORAGE_BACKEND='local', the
+    default) or an S3-compatible bucket ('object'), with an in-memory
+    stand-in when boto3 or UPLOAD_STORAGE_URL is missing.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.saved = 0
+        self.deduplicated = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if app.config['UPLOAD_STORAGE_BACKEND'] == 'object':
+            url = app.config['UPLOAD_STORAGE_URL']
+            bucket = url.split('://', 1)[-1].split('/', 1)[0] if url else 'uploads'
+            self.backend = ObjectStorage(make_object_client(url), bucket, app.config['UPLOAD_STORAGE_PREFIX'],
+                                         app.config['UPLOAD_PUBLIC_URL'])
+        else:
+            root = os.path.abspath(app.config['UPLOAD_FOLDER'])
+            static_prefix = os.path.relpath(root, os.path.abspath(app.static_folder)).replace(os.sep, '/')
+            self.backend = LocalStorage(root, None if static_prefix.startswith('..') else static_prefix)
+        app.add_url_rule('/uploads/<path:key>', 'upload', self.serve_view)
+        app.add_template_global(self.url, 'upload_url')
+        app.extensions['upload_storage'] = self
+
+    def save(self, file_storage, namespace, max_bytes, allowed_kinds):
+        """
+        Stores file_storage as namespace/<sha256>.<kind> with save_upload(),
+        unless that blob already exists. Returns (filename, sha256_hex,
+        size, deduplicated); filename is relative to the namespace. Raises
+        UploadError like save_upload().
+        """
+        staged = {}
+
+        def name_func(kind, checksum):
+            staged['filename'] = '%s.%s' % (checksum, kind)
+            # a dot name of its own: never served, and concurrent uploads of the same bytes don't share it
+            return '.upload-%s-%s' % (secrets.token_hex(4), staged['filename'])
+
+        temp_dir = self.backend.temp_dir(namespace)
+        tmp_name, checksum, size = save_upload(file_storage, temp_dir, max_bytes, allowed_kinds, name_func)
+        tmp_path = os.path.join(temp_dir, tmp_name)
+        filename = staged['filename']
+        key = '%s/%s' % (namespace, filename)
+        try:
+            deduplicated = self.backend.exists(key)
+            if deduplicated:
+                # keeps a concurrent collect_garbage() from treating it as an old orphan
+                self.backend.touch(key)
+                os.remove(tmp_path)
+                self.deduplicated += 1
+            else:
+                self.backend.put_file(key, tmp_path)
+                self.saved += 1
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return filename, checksum, size, deduplicated
+
+    def url(self, namespace, filename):
+        return self.backend.url('%s/%s' % (namespace, filename))
+
+    @contextmanager
+    def workdir(self, namespace, filename):
+        """
+        A local directory holding namespace/filename, for tools that need
+        real files (image variants). Files written under it are stored
+        under the namespace when the block exits.
+        """
+        if isinstance(self.backend, LocalStorage):
+            yield self.backend._path(namespace)
+            return
+        with tempfile.TemporaryDirectory(prefix='portfolio-upload-') as tmp:
+            with closing(self.backend.open('%s/%s' % (namespace, filename))) as src, \
+                    open(os.path.join(tmp, filename), 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            yield tmp
+            for dirpath, _, names in os.walk(tmp):
+                for name in names:
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, tmp).replace(os.sep, '/')
+                    if rel != filename:
+                        self.backend.put_file('%s/%s' % (namespace, rel), path)
+
+    def list(self, namespace):
+        """Yields (name relative to namespace, modified timestamp) for every blob under it."""
+        for key, modified in self.backend.list(namespace + '/'):
+            yield key[len(namespace) + 1:], modified
+
+    def collect_garbage(self, namespace, referenced, grace_seconds=3600, dry_run=False):
+        """
+        Deletes blobs under namespace that aren't in `referenced` (filenames
+        relative to the namespace) and are older than grace_seconds.
+        Derived files (variants/<stem>-320w.jpg) live as long as their
+        original. Returns the keys deleted, or that would be with dry_run.
+        """
+        stems = {name.rsplit('.', 1)[0] for name in referenced}
+        cutoff = time.time() - grace_seconds
+        removed = []
+        for name, modified in self.list(namespace):
+            key = '%s/%s' % (namespace, name)
+            if '/' in name:
+                stem = name.rsplit('/', 1)[1].rsplit('-', 1)[0]
+                if stem in stems:
+                    continue
+            elif name in referenced:
+                continue
+            if modified > cutoff:
+                continue
+            if not dry_run:
+                self.backend.delete(key)
+            removed.append(key)
+        return removed
+
+    def serve_view(self, key):
+        """Serves a stored blob; content-addressed names never change, so they cache forever."""
+        if any(part.startswith('.') for part in key.split('/')):
+            # in-flight .upload-* temp files and anything else hidden
+            abort(404)
+        try:
+            body = self.backend.open(key)
+        except Exception:
+            # missing file, key outside the root, or the object store's not-found error
+            abort(404)
+        mimetype = MIMETYPES.get(key.rsplit('.', 1)[-1].lower(), 'application/octet-stream')
+        response = Response(iter(lambda: body.read(CHUNK_SIZE), b''), mimetype=mimetype, direct_passthrough=True)
+        response.call_on_close(body.close)
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        return response
+
+    def stats(self):
+        return {'saved': self.saved, 'deduplicated': self.deduplicated}
@@ -0,0 +1,49 @@
+"""Work that runs off the request thread: background jobs and upload callbacks."""
+import json
+import os
+
+
+from models import db, Certification
+from bulk_sync import sync_resume_data, changed_models
+from extensions import cert_images, content_cache, job_queue, resume_store
+from resume_parser import merge_parsed, parse_resume, write_resume_data
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+@job_queue.register('resume_sync')
+def run_resume_sync(pdf_path, sections=()):
+    # upload -> parse -> apply changed sections to resume_data.json -> DB, off the request thread
+    data_dir = os.path.dirname(resume_store.path)
+    parsed_path = os.path.join(data_dir, 'resume_parsed.json')
+    data, from_cache = parse_resume(pdf_path, cache_path=os.path.join(data_dir, '.resume_cache.json'))
+    # the last upload's parse tells which sections the new PDF actually changed
+    previous = _load_json(parsed_path)
+    current = _load_json(resume_store.path) or {}
+    merged, taken = merge_parsed(current, data, previous, sections)
+    if taken:
+        write_resume_data(merged, resume_store.path)
+    write_resume_data(data, parsed_path)
+    # rows of entries the new PDF dropped are removed; rows added from the dashboard are kept
+    report = sync_resume_data(db.engine, merged, previous=current)
+    # resume_store notices the new file by mtime; the DB sections need an explicit invalidation
+    content_cache.invalidate(*changed_models(report))
+    return {'parsed_from_cache': from_cache, 'updated_sections': taken, 'sync': report}
+
+
+def store_cert_variants(cert_id, variants):
+    # called from the image worker thread once thumbnails/WebP files exist
+    cert = db.session.get(Certification, cert_id)
+    if cert is not None:
+        cert.image_variants = variants
+        db.session.commit()
+    content_cache.invalidate('Certification')
+
+
+cert_images.on_done = store_cert_variants
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+
+# leading bytes of each accepted file type -> canonical extension
+SIGNATURES = (
+    (b'%PDF-', 'pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+class UploadError(Exception):
+    """Rejected upload; message is safe to show to the admin."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def sniff(head):
+    """Returns the canonical extension for the file starting with `head`, or None."""
+    for signature, kind in SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    return None
+
+
+def save_upload(file_storage, dest_dir, max_bytes, allowed_kinds, name_func):
+    """
+    Streams an uploaded file to disk in CHUNK_SIZE pieces and moves it into
+    place with an atomic rename, so readers see either the old file or the
+    complete new one.
+
+    The type is taken from the file's magic bytes, not its name, and must
+    be in allowed_kinds. name_func(kind, sha256_hex) returns the final
+    filename. Returns (filename, sha256_hex, size). Raises UploadError when
+    the file is empty, of the wrong type, or larger than max_bytes.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    stream = file_storage.stream
+    digest = hashlib.sha256()
+    size = 0
+    kind = None
+    # temp file in the destination dir so os.replace() never crosses filesystems
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if kind is None:
+                    kind = sniff(chunk)
+                    if kind not in allowed_kinds:
+                        raise UploadError('Invalid file type. Allowed: %s.' % ', '.join(sorted(allowed_kinds)))
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError('File is too large (limit %d MB).' % (max_bytes // (1024 * 1024)), status=413)
+                digest.update(chunk)
+                out.write(chunk)
+            if size == 0:
+                raise UploadError('Uploaded file is empty.')
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp makes the file 0600; the front-end server (static files, X-Sendfile/X-Accel)
+        # may run as another user and has to be able to read it
+        os.chmod(tmp_path, 0o644)
+        checksum = digest.hexdigest()
+        filename = name_func(kind, checksum)
+        os.replace(tmp_path, os.path.join(dest_dir, filename))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename, checksum, size
+
+
+def write_checksum(path, checksum):
+    """Records `checksum` next to `path` as path.sha256, atomically."""
+    tmp_path = path + '.sha256.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('%s  %s\n' % (checksum, os.path.basename(path)))
+    os.replace(tmp_path, path + '.sha256')
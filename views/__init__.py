@@ -0,0 +1,12 @@
+"""
+Blueprints, imported by create_app() only when they are registered, so an
+app built for a script (create_app(blueprints=())) doesn't import any view
+code or the upload/bulk/parsing modules the admin views pull in.
+"""
+
+# blueprint name -> module defining `bp`
+BLUEPRINTS = {
+    'public': 'views.public',
+    'api': 'views.api',
+    'admin': 'views.admin',
+}
@@ -0,0 +1,322 @@
+import json
+import os
+
+from flask import (Blueprint, Response, current_app, flash, jsonify, redirect, render_template, request,
+                   stream_with_context, url_for)
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import insert
+
+from auth import admin_required, current_admin, login_admin, logout_admin
+from models import db, User, Experience, Project, Certification
+from bulk_io import BULK_MODELS, RecordError, export_ndjson, import_ndjson
+from extensions import cert_images, content_cache, job_queue, login_guard, resume_file, upload_storage
+from login_guard import LoginRejected
+from uploads import UploadError, save_upload, write_checksum
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+
+# Admin endpoints (AJAX)
+def require_json(req):
+    try:
+        return req.get_json(force=True)
+    except:
+        return None
+
+# --- Existing Admin Endpoints ---
+# The add endpoints take one item, as before, or a list of them: a list is
+# inserted in a single transaction and answered with one result per item.
+
+def build_experience(data):
+    company = data.get('company')
+    role = data.get('role')
+    if not company or not role:
+        raise RecordError('Missing required fields')
+    return Experience(company=company, role=role, duration=data.get('duration',''), responsibilities=data.get('responsibilities',[]))
+
+def build_project(data):
+    title = data.get('title')
+    if not title:
+        raise RecordError('Missing title')
+    return Project(title=title, description=data.get('description',''), link=data.get('link',''))
+
+def insert_rows(rows):
+    """
+    Inserts ORM objects built (but not added) by a build_* function in the
+    current transaction and sets their ids. Where the database supports
+    INSERT ... RETURNING, SQLAlchemy sends multi-row statements when it can
+    match the returned ids to the rows (Postgres, MariaDB) and one row per
+    statement when it can't (SQLite, which doesn't guarantee RETURNING
+    order); MySQL goes through the ORM. Either way there is one commit.
+    """
+    if not db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        db.session.add_all(rows)
+        db.session.flush()
+        return
+    model = type(rows[0])
+    columns = [c.key for c in model.__table__.columns if not c.primary_key]
+    # unset columns are left out rather than sent as NULL (a JSON column would store 'null')
+    groups = {}
+    for row in rows:
+        values = {key: getattr(row, key) for key in columns if getattr(row, key) is not None}
+        groups.setdefault(tuple(values), []).append((row, values))
+    for group in groups.values():
+        ids = db.session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True), [values for _, values in group]
+        ).all()
+        for (row, _), row_id in zip(group, ids):
+            row.id = row_id
+
+def add_items(items, build, model_name):
+    """
+    Builds a row per item, inserts the valid ones in one transaction and
+    returns ([{'index', 'success', 'id' or 'message'}], rows added).
+    """
+    if len(items) > current_app.config['ADMIN_BATCH_MAX_ITEMS']:
+        raise RecordError('At most %d items per request' % current_app.config['ADMIN_BATCH_MAX_ITEMS'])
+    results, added = [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise RecordError('Item must be a JSON object')
+            row = build(item)
+        except RecordError as e:
+            results.append({'index': index, 'success': False, 'message': str(e)})
+            continue
+        results.append({'index': index, 'success': True})
+        added.append((results[-1], row))
+    if added:
+        insert_rows([row for _, row in added])
+        db.session.commit()
+        content_cache.invalidate(model_name)
+        for result, row in added:
+            result['id'] = row.id
+    return results, [row for _, row in added]
+
+def batch_response(results, noun):
+    added = sum(1 for r in results if r['success'])
+    return jsonify({'success': added == len(results), 'message': '%d of %d %s added' % (added, len(results), noun),
+                    'results': results}), 200 if added or not results else 400
+
+def add_json(build, model_name, message, noun):
+    data = require_json(request)
+    if isinstance(data, list):
+        try:
+            results, _ = add_items(data, build, model_name)
+        except RecordError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return batch_response(results, noun)
+    if not data or not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Invalid JSON'}), 400
+    try:
+        row = build(data)
+    except RecordError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    db.session.add(row)
+    db.session.commit()
+    content_cache.invalidate(model_name)
+    return jsonify({'success': True, 'message': message, 'id': row.id})
+
+@bp.route('/add_experience', methods=['POST'])
+@admin_required
+def add_experience():
+    return add_json(build_experience, 'Experience', 'Experience added', 'experiences')
+
+@bp.route('/add_project', methods=['POST'])
+@admin_required
+def add_project():
+    return add_json(build_project, 'Project', 'Project added', 'projects')
+
+# --- New Admin Endpoints ---
+
+def allowed_file(filename):
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def store_cert_image(file):
+    """Saves an uploaded image; returns (filename, variants of an identical earlier upload or None)."""
+    # stored under its SHA-256, so the same image uploaded twice is kept once
+    image_filename, _, _, deduplicated = upload_storage.save(
+        file, 'certs',
+        max_bytes=current_app.config['MAX_CERT_IMAGE_BYTES'],
+        allowed_kinds={'png', 'jpg', 'gif'},
+    )
+    image_variants = None
+    if deduplicated:
+        # another certificate already has this image; its thumbnails are ours too
+        image_variants = db.session.execute(
+            db.select(Certification.image_variants)
+            .where(Certification.image_file == image_filename, Certification.image_variants.isnot(None))
+            .limit(1)
+        ).scalar()
+    return image_filename, image_variants
+
+def build_certification(data, file=None):
+    title = data.get('title')
+    organization = data.get('organization')
+    year = data.get('year')
+
+    if not all([title, organization, year]):
+        raise RecordError('Missing required fields')
+
+    image_filename = None
+    image_variants = None
+    if file and file.filename != '' and allowed_file(file.filename):
+        image_filename, image_variants = store_cert_image(file)
+
+    new_cert = Certification(
+        title=title,
+        organization=organization,
+        year=year,
+        image_file=image_filename
+    )
+    if image_variants is not None:
+        new_cert.image_variants = image_variants
+    return new_cert
+
+def process_cert_images(certs):
+    for cert in certs:
+        if cert.image_file and cert.image_variants is None:
+            cert_images.submit(cert.id, cert.image_file)
+
+@bp.route('/add_certification', methods=['POST'])
+@admin_required
+def add_certification():
+    if 'items' in request.form:
+        # batch: a JSON list in `items`; an item's "image" names the file field holding its image
+        try:
+            items = json.loads(request.form['items'])
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            return jsonify({'success': False, 'message': 'items must be a JSON list'}), 400
+
+        def build(item):
+            try:
+                return build_certification(item, request.files.get(item.get('image') or ''))
+            except UploadError as e:
+                raise RecordError(e.message)
+        try:
+            results, certs = add_items(items, build, 'Certification')
+        except RecordError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        process_cert_images(certs)
+        return batch_response(results, 'certifications')
+
+    try:
+        new_cert = build_certification(request.form, request.files.get('image'))
+    except RecordError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except UploadError as e:
+        return jsonify({'success': False, 'message': e.message}), e.status
+    db.session.add(new_cert)
+    db.session.commit()
+    content_cache.invalidate('Certification')
+    process_cert_images([new_cert])
+
+    return jsonify({'success': True, 'message': 'Certification added successfully!', 'id': new_cert.id})
+
+@bp.route('/upload_resume', methods=['POST'])
+@admin_required
+def upload_resume():
+    if 'resume' not in request.files:
+        return jsonify({'success': False, 'message': 'No file part in request.'}), 400
+
+    file = request.files['resume']
+    if file.filename == '':
+        return jsonify({'success': False, 'message': 'No file selected.'}), 400
+
+    resume_dir = os.path.join(current_app.static_folder, 'resume')
+    try:
+        # The file will always be named 'resume.pdf'; it is written to a temp file
+        # and renamed over the old one so downloads never see a partial PDF
+        _, checksum, size = save_upload(
+            file, resume_dir,
+            max_bytes=current_app.config['MAX_RESUME_BYTES'],
+            allowed_kinds={'pdf'},
+            name_func=lambda kind, checksum: 'resume.pdf',
+        )
+    except UploadError as e:
+        if e.status == 400:
+            return jsonify({'success': False, 'message': 'Invalid file type. Please upload a PDF.'}), 400
+        return jsonify({'success': False, 'message': e.message}), e.status
+    write_checksum(os.path.join(resume_dir, 'resume.pdf'), checksum)
+    resume_file.reload()
+    job_id = None
+    if current_app.config['RESUME_AUTO_SYNC']:
+        job_id = job_queue.enqueue('resume_sync', pdf_path=os.path.join(resume_dir, 'resume.pdf'),
+                                   sections=list(current_app.config['RESUME_SYNC_SECTIONS']))
+    return jsonify({'success': True, 'message': 'Resume uploaded successfully!', 'sha256': checksum, 'size': size, 'job_id': job_id})
+
+@bp.route('/jobs')
+@admin_required
+def jobs():
+    return jsonify({'success': True, 'jobs': job_queue.recent()})
+
+@bp.route('/jobs/<job_id>')
+@admin_required
+def job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@bp.route('/bulk', methods=['GET'])
+@admin_required
+def bulk_export():
+    names = request.args.getlist('model') or list(BULK_MODELS)
+    unknown = [n for n in names if n not in BULK_MODELS]
+    if unknown:
+        return jsonify({'success': False, 'message': 'Unknown model(s): %s' % ', '.join(unknown)}), 400
+    lines = export_ndjson(db.engine, names, batch_size=current_app.config['BULK_BATCH_SIZE'])
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=portfolio.ndjson'})
+
+@bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_import():
+    # read the body line by line instead of loading it whole
+    report = import_ndjson(request.stream, db.engine, batch_size=current_app.config['BULK_BATCH_SIZE'])
+    if report['inserted']:
+        content_cache.invalidate(*report['inserted'])
+    return jsonify({'success': not report['errors'], **report}), 200 if report['inserted'] or not report['errors'] else 400
+
+# Simple admin login route for accessing admin dashboard (for demonstration)
+@bp.route('/login', methods=['GET','POST'])
+def login():
+    if current_admin() is not None:
+        return redirect(url_for('admin.dashboard'))
+
+    if request.method=='POST':
+        username = request.form.get('username') or ''
+        password = request.form.get('password') or ''
+        try:
+            # rate limits first: a rejected attempt costs neither a query nor a bcrypt round
+            login_guard.throttle(request.remote_addr, username)
+            user = User.query.filter_by(username=username).first()
+            matched = login_guard.verify(user.password_hash if user else None, password)
+        except LoginRejected as e:
+            flash(e.message, 'danger')
+            return (render_template('admin_login.html', csrf_token=generate_csrf), e.status,
+                    {'Retry-After': str(e.retry_after)})
+        if matched:
+            login_admin(user)
+            flash('Login successful!', 'success')
+            return redirect(url_for('admin.dashboard'))
+        flash('Invalid credentials', 'danger')
+    return render_template('admin_login.html', csrf_token=generate_csrf)
+
+@bp.route('/dashboard')
+@admin_required(page=True)
+def dashboard():
+    # Create upload directories if they don't exist
+    os.makedirs(os.path.join(current_app.config['UPLOAD_FOLDER'], 'certs'), exist_ok=True)
+    os.makedirs(os.path.join(current_app.static_folder, 'resume'), exist_ok=True)
+
+    return render_template('admin_dashboard.html')
+
+@bp.route('/logout')
+def logout():
+    logout_admin()
+    flash('You have been logged out.', 'info')
+    return redirect(url_for('admin.login'))
@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify, url_for
+
+from extensions import page_cache
+from snapshot import thaw
+from views.common import list_page, run_search
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+
+def api_listing(name, attr):
+    # JSON clients get no flash message; it would show up on their next page view instead
+    items, next_cursor = list_page(name, attr, warn=False)
+    items = thaw(items)
+    if isinstance(items, dict):
+        # fallback skills are grouped by category; the API always returns a flat list
+        items = [{'category': category, 'name': skill} for category, skills in items.items() for skill in skills]
+    return jsonify({'items': items, 'next': next_cursor})
+
+@bp.route('/projects')
+@page_cache.cached
+def projects():
+    return api_listing('Project', 'projects')
+
+@bp.route('/certifications')
+@page_cache.cached
+def certifications():
+    return api_listing('Certification', 'certifications')
+
+@bp.route('/skills')
+@page_cache.cached
+def skills():
+    return api_listing('Skill', 'skills')
+
+@bp.route('/education')
+@page_cache.cached
+def education():
+    return api_listing('Education', 'education')
+
+@bp.route('/search')
+def search():
+    query, results, took_ms = run_search()
+    for result in results:
+        result['url'] = url_for(result.pop('endpoint'))
+    return jsonify({'query': query, 'results': results, 'took_ms': round(took_ms, 3)})
@@ -0,0 +1,54 @@
+import time
+
+from flask import abort, current_app, flash, request
+
+from extensions import DB_ERRORS, db_breaker, instrumentation, page_cache, search_index, snapshot_service
+from pagination import CursorError, keyset_page
+from search import SECTIONS as SEARCH_SECTIONS
+
+
+def get_snapshot(warn=True):
+    # every page renders from the same snapshot: one query set per content version
+    with instrumentation.track('snapshot'):
+        snapshot = snapshot_service.get()
+    if not snapshot.db_available:
+        # the content version doesn't change when the DB comes back, so fallback pages must not be cached
+        page_cache.skip()
+        if warn:
+            flash("Database not connected. Displaying fallback data.", "warning")
+    return snapshot
+
+
+def list_page(name, attr, warn=True):
+    """
+    One keyset page of a listing for the current request's ?after= and
+    ?limit=, as (items, next cursor). Falls back to the whole snapshot
+    section (unpaginated, with the usual warning) when the DB is down or
+    the table is empty.
+    """
+    after = request.args.get('after')
+    limit = min(max(request.args.get('limit', current_app.config['PAGE_SIZE'], type=int) or 1, 1),
+                current_app.config['PAGE_SIZE_MAX'])
+    try:
+        page = db_breaker.call(lambda: keyset_page(name, after=after, limit=limit))
+    except CursorError:
+        abort(400, description='Invalid pagination cursor.')
+    except DB_ERRORS:
+        # a DB-backed snapshot may still be memoized, so get_snapshot() won't skip the cache for us
+        page_cache.skip()
+        page = None
+    if page is None or (not page.items and not after):
+        return getattr(get_snapshot(warn=warn), attr), None
+    return page.items, page.next
+
+
+def run_search():
+    query = request.args.get('q', '').strip()[:200]
+    sections = [s for s in request.args.getlist('section') if s in SEARCH_SECTIONS]
+    limit = min(request.args.get('limit', current_app.config['SEARCH_RESULT_LIMIT'], type=int) or 1, 100)
+    start = time.perf_counter()
+    # re-indexes only sections that changed since the last content version
+    search_index.refresh(get_snapshot(warn=False))
+    with instrumentation.track('search'):
+        results = search_index.search(query, limit=limit, sections=sections)
+    return query, results, (time.perf_counter() - start) * 1000
@@ -0,0 +1,67 @@
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from extensions import db_breaker, page_cache, pool_monitor, resume_file
+from views.common import get_snapshot, list_page, run_search
+
+bp = Blueprint('public', __name__)
+
+
+@bp.route('/')
+@page_cache.cached
+def index():
+    snapshot = get_snapshot()
+    return render_template('index.html', profile=snapshot.profile, contact=snapshot.contact)
+
+@bp.route('/about')
+@page_cache.cached
+def about():
+    snapshot = get_snapshot(warn=False)
+    return render_template('about.html', data=snapshot.resume)
+
+@bp.route('/educational-qualification')
+@page_cache.cached
+def educational():
+    snapshot = get_snapshot()
+    return render_template('educational.html', educations=snapshot.education)
+
+@bp.route('/professional-experience')
+@page_cache.cached
+def professional():
+    snapshot = get_snapshot()
+    return render_template('professional_experience.html', experiences=snapshot.experience)
+
+@bp.route('/certifications')
+@page_cache.cached
+def certifications():
+    certs, next_cursor = list_page('Certification', 'certifications')
+    return render_template('certifications.html', certs=certs, next_cursor=next_cursor)
+
+@bp.route('/technical-skills')
+@page_cache.cached
+def technical_skills():
+    snapshot = get_snapshot()
+    return render_template('technical_skills.html', skills=snapshot.skills)
+
+@bp.route('/projects')
+@page_cache.cached
+def projects():
+    items, next_cursor = list_page('Project', 'projects')
+    return render_template('projects.html', projects=items, next_cursor=next_cursor)
+
+@bp.route('/search')
+@page_cache.cached
+def search():
+    query, results, took_ms = run_search()
+    return render_template('search.html', query=query, results=results, took_ms=took_ms)
+
+@bp.route('/metrics/db')
+def db_metrics():
+    return jsonify({'breaker': db_breaker.stats(), 'pool': pool_monitor.stats()})
+
+@bp.route('/download_resume')
+def download_resume():
+    response = resume_file.send(request)
+    if response is not None:
+        return response
+    flash('Resume not found.', 'warning')
+    return redirect(request.referrer or url_for('public.index'))